@@ -5,7 +5,12 @@
 Set-Location scripts
 
 # Create a directory to store today's analysis with time in data/qq
-$ANALYSIS_DIR = "../data/qq/$(Get-Date -Format 'MM-dd-yyyy_HH-mm-ss')"
+# (a scratch directory when replaying, so replayed pages don't become snapshots)
+if ($env:STONKS_REPLAY) {
+    $ANALYSIS_DIR = Join-Path ([System.IO.Path]::GetTempPath()) "stonks-replay-$(Get-Date -Format 'MM-dd-yyyy_HH-mm-ss')"
+} else {
+    $ANALYSIS_DIR = "../data/qq/$(Get-Date -Format 'MM-dd-yyyy_HH-mm-ss')"
+}
 New-Item -ItemType Directory -Path $ANALYSIS_DIR -Force | Out-Null
 
 Write-Host "Starting trading analysis pipeline..." -ForegroundColor Green
@@ -1,8 +1,20 @@
 #!/bin/bash
 cd scripts/
+
+# Instant mode: print the cached picks right away, then refresh and show what changed
+if [ "$1" == "--quick" ]; then
+  exec python quick.py
+fi
+
 # Create a directory to store today's analysis in data/
-ANALYSIS_DIR="../data/$(date +"%m-%d-%Y")"
-mkdir -p "$ANALYSIS_DIR"
+if [ -n "$STONKS_REPLAY" ]; then
+  # Replayed pages aren't new snapshots; keep their files out of data/ so
+  # history.py, signals.py --history and the portfolio index don't count them
+  ANALYSIS_DIR="$(mktemp -d "${TMPDIR:-/tmp}/stonks-replay.XXXXXX")"
+else
+  ANALYSIS_DIR="../data/$(date +"%m-%d-%Y")"
+  mkdir -p "$ANALYSIS_DIR"
+fi
 
 # Get current time for file naming
 TIMESTAMP=$(date +"%H-%M-%S")
@@ -2,9 +2,16 @@ import sys
 import pandas as pd
 from collections import defaultdict
 import argparse
+import json
 from datetime import datetime
-import requests
 from bs4 import BeautifulSoup
+from archive import fetch_html, add_replay_argument, apply_replay
+from output import Writer, add_format_argument, yahoo_link
+from client import query
+from scraper import select_table
+from memtrack import stage
+from rowfilter import RowFilter, filter_congress_rows, most_recent, normalize_date
+from quick import cache_sections
 
 CONFIG = {
     'insider': {
@@ -19,60 +26,31 @@ CONFIG = {
     }
 }
 
-def make_yahoo_finance_links(tickers):
-    """
-    Convert a list of ticker symbols into clickable terminal links to Yahoo Finance.
-    
-    Args:
-        tickers: List of ticker symbols (strings)
-        
-    Returns:
-        List of formatted strings with clickable links for terminals that support 
-        OSC 8 hyperlink escape sequences.
-    """
-    clickable_tickers = []
-    
-    for ticker in tickers:
-        # Clean the ticker symbol (remove any whitespace)
-        clean_ticker = ticker.strip()
-        
-        # Yahoo Finance URL format
-        url = f"https://finance.yahoo.com/quote/{clean_ticker}"
-        
-        # OSC 8 escape sequence format for terminal hyperlinks
-        # Format: \033]8;;URL\033\\TEXT\033]8;;\033\\
-        clickable = f"\033]8;;{url}\033\\{clean_ticker}\033]8;;\033\\"
-        
-        clickable_tickers.append(clickable)
-    
-    return clickable_tickers
-
-def make_yahoo_finance_link(ticker):
-    """
-    Convert a single ticker symbol into a clickable terminal link to Yahoo Finance.
-    """
-    clean_ticker = ticker.strip()
-    url = f"https://finance.yahoo.com/quote/{clean_ticker}"
-    return f"\033]8;;{url}\033\\{clean_ticker}\033]8;;\033\\"
-
 def fetch_table(url, selector):
     """Fetch HTML table from URL"""
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
     try:
-        resp = requests.get(url, headers=headers)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        return soup.select_one(selector)
+        with stage('fetch'):
+            html = fetch_html(url, headers=headers, selector=selector)
+        with stage('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
+            del html
+            return select_table(soup, selector)
     except Exception as e:
         print(f"Error fetching table: {e}", file=sys.stderr)
         return None
 
-def extract_congress_data(table):
+def extract_congress_data(table, filters=None):
     """
     Extract data from congress trading table into structured format.
     
+    Args:
+        table: BeautifulSoup table element
+        filters: Optional RowFilter; rows it rejects are skipped before the
+                 rest of their cells are read
+    
     Returns:
         List of dictionaries containing transaction data
     """
@@ -91,6 +69,18 @@ def extract_congress_data(table):
             if len(cells) < 5:  # Ensure we have enough cells
                 continue
                 
+            # Extract transaction type
+            transaction_span = cells[1].find('span')
+            transaction = transaction_span.get_text(strip=True) if transaction_span else None
+            
+            # Extract trade date
+            trade_date = cells[4].get_text(strip=True)
+            
+            # Check the cheap filters before reading the rest of the row
+            if filters and not (filters.accepts_transaction(transaction)
+                                and filters.accepts_date(trade_date)):
+                continue
+            
             # Extract ticker
             ticker_span = (cells[0].find('span', class_='positive') or 
                           cells[0].find('span', class_='negative') or 
@@ -98,10 +88,8 @@ def extract_congress_data(table):
             ticker = ticker_span.get_text(strip=True) if ticker_span else None
             if ticker == '-' or not ticker:
                 continue
-                
-            # Extract transaction type
-            transaction_span = cells[1].find('span')
-            transaction = transaction_span.get_text(strip=True) if transaction_span else None
+            if filters and not filters.accepts_ticker(ticker):
+                continue
             
             # Extract politician name
             politician = cells[2].get_text(strip=True)
@@ -109,9 +97,6 @@ def extract_congress_data(table):
             # Extract filing date
             filed_date = cells[3].get_text(strip=True)
             
-            # Extract trade date
-            trade_date = cells[4].get_text(strip=True)
-            
             # Create data entry
             entry = {
                 'Stock': ticker,
@@ -129,58 +114,58 @@ def extract_congress_data(table):
             
     return data
 
-def get_recent_congress_purchases():
+def get_recent_congress_records(data=None, limit=5, since=None, tickers=None):
     """
-    Fetch recent congress purchases and return formatted data
+    Fetch recent congress purchases as structured records
+    
+    Args:
+        data: Rows from extract_congress_data. If omitted they come from the
+              query service when one is running, otherwise from QuiverQuant.
+        limit: How many of the most recent purchases to return
+        since: Only purchases traded on or after this date
+        tickers: Only purchases of these tickers
     
     Returns:
-        List of formatted strings for recent congress purchases
+        List of dicts with ticker, transaction, politician and traded date
+        for the most recent congress purchases
     """
     url = 'https://www.quiverquant.com/congresstrading/'
     selector = 'table.table-congress.table-politician'
     
-    table = fetch_table(url, selector)
-    data = extract_congress_data(table)
-    
-    if not data:
-        return []
-    
-    # Convert to DataFrame for easier processing
-    df = pd.DataFrame(data)
-    
-    # Convert dates to datetime if needed
-    try:
-        df['Traded'] = pd.to_datetime(df['Traded'], errors='coerce')
-    except:
-        pass
-    
-    # Filter for purchases only
-    df = df[df['Transaction'].str.contains('Purchase', case=False, na=False)]
+    filters = RowFilter(action='purchase', since=since, tickers=tickers)
     
-    # Sort by most recent trades first
-    if not df.empty:
-        df = df.sort_values(by='Traded', ascending=False)
+    if data is None:
+        data = query('/congress')
+    if data is None:
+        table = fetch_table(url, selector)
+        with stage('extract'):
+            data = extract_congress_data(table, filters)
+        del table
     
-    # Get top 5 recent purchases
-    recent_purchases = []
-    for _, row in df.head(5).iterrows():
-        # Format the date nicely
-        try:
-            if pd.notna(row['Traded']):
-                formatted_date = row['Traded'].strftime('%Y-%m-%d')
-            else:
-                formatted_date = str(row['Traded'])
-        except:
-            formatted_date = str(row['Traded'])
-        
-        # Create clickable ticker link
-        clickable_ticker = make_yahoo_finance_link(row['Stock'])
-        
-        # Format the line
-        formatted_line = f"{clickable_ticker}    {row['Transaction']}    {row['Politician']} {formatted_date}"
-        recent_purchases.append(formatted_line)
+    # Keep only the newest few instead of sorting every purchase
+    recent = most_recent(filter_congress_rows(data or [], filters), limit)
+    return [
+        {
+            'ticker': row['Stock'],
+            'transaction': row['Transaction'],
+            'politician': row['Politician'],
+            'traded': normalize_date(row['Traded'])
+        }
+        for row in recent
+    ]
+
+def format_congress_purchase(record, link=yahoo_link):
+    """Format one recent congress purchase record as a terminal line"""
+    return f"{link(record['ticker'])}    {record['transaction']}    {record['politician']} {record['traded']}"
+
+def get_recent_congress_purchases():
+    """
+    Fetch recent congress purchases and return formatted data
     
-    return recent_purchases
+    Returns:
+        List of formatted strings for recent congress purchases
+    """
+    return [format_congress_purchase(record) for record in get_recent_congress_records()]
 
 def parse_ticker_data(input_file=None):
     """Parse ticker data from file or stdin and return as a dictionary."""
@@ -201,6 +186,15 @@ def parse_ticker_data(input_file=None):
             if not line or line.startswith("---") or line.startswith("python"):
                 continue
                 
+            # Structured input from scrape.py --format ndjson
+            if line.startswith("{"):
+                record = json.loads(line)
+                ticker_data.append({
+                    'ticker': record['ticker'],
+                    'purchases': int(record['purchases'])
+                })
+                continue
+                
             # Parse the line: ticker purchases
             parts = line.split()
             
@@ -238,8 +232,7 @@ def analyze_ticker_data(ticker_data):
         return {
             'dataframe': df,
             'total_purchases': 0,
-            'most_purchases': None,
-            'purchases_sorted': df
+            'most_purchases': None
         }
     
     # Calculate totals
@@ -248,42 +241,44 @@ def analyze_ticker_data(ticker_data):
     # Find ticker with most purchases
     most_purchases = df.loc[df['purchases'].idxmax()] if not df['purchases'].empty else None
     
-    # Sort by purchases
-    purchases_sorted = df.sort_values('purchases', ascending=False)
-    
+    # No full sort here: summaries take their top few with nlargest
     return {
         'dataframe': df,
         'total_purchases': total_purchases,
-        'most_purchases': most_purchases,
-        'purchases_sorted': purchases_sorted
+        'most_purchases': most_purchases
     }
 
-def print_summary(analysis, cfg):
-    """Print a summary of the analysis with clickable Yahoo Finance links."""
+def summary_records(analysis, cfg):
+    """Return the structured records that print_summary shows for a source."""
+    if cfg['title'] == 'congress':
+        # For congress, show recent detailed purchases
+        return get_recent_congress_records()
+    
+    # For insider, show top 5 tickers
+    df = analysis['dataframe']
+    if df.empty:
+        return []
+    return [
+        {'ticker': row['ticker'], 'purchases': int(row['purchases'])}
+        for _, row in df.nlargest(5, 'purchases').iterrows()
+    ]
+
+def print_summary(analysis, cfg, out=None):
+    """Print a summary of the analysis with clickable Yahoo Finance links, returning its records."""
     # Get current date and format as MM-DD-YYYY
     current_date = datetime.now().strftime("%m-%d-%Y")
+    title = f"Recent {cfg['title'].capitalize()} Purchases ({current_date})"
     
+    writer = out or Writer()
+    records = summary_records(analysis, cfg)
     if cfg['title'] == 'congress':
-        # For congress, show recent detailed purchases
-        print(f"--- Recent {cfg['title'].capitalize()} Purchases ({current_date}) ---")
-        recent_purchases = get_recent_congress_purchases()
-        for purchase in recent_purchases:
-            print(purchase)
+        writer.section(title, records, lambda record: format_congress_purchase(record, writer.link))
     else:
-        # For insider, show top 5 tickers as before but with "Recent" in title
-        print(f"--- Recent {cfg['title'].capitalize()} Purchases ({current_date}) ---")
-        
-        # Get top 5 tickers
-        top_tickers = []
-        for _, row in analysis['purchases_sorted'].iloc[:5].iterrows():
-            top_tickers.append(row['ticker'])
-        
-        # Convert to clickable links
-        clickable_tickers = make_yahoo_finance_links(top_tickers)
-        
-        # Print each clickable ticker
-        for ticker in clickable_tickers:
-            print(ticker)
+        writer.section(title, records)
+    
+    if out is None:
+        writer.close()
+    return records
 
 def export_data(analysis, cfg):
     """Export the analyzed data to a CSV file."""
@@ -296,7 +291,10 @@ def main():
     p = argparse.ArgumentParser(description='Analyze trading purchase data')
     p.add_argument('source', choices=CONFIG.keys(), help='Which dataset to analyze')
     p.add_argument('input_file', nargs='?', help='Input file (reads from stdin if not provided)')
+    add_format_argument(p)
+    add_replay_argument(p)
     args = p.parse_args()
+    apply_replay(args)
     cfg = CONFIG[args.source]
     
     if args.input_file:
@@ -304,11 +302,20 @@ def main():
     else:
         ticker_data = parse_ticker_data()
     
-    analysis = analyze_ticker_data(ticker_data)
-    print_summary(analysis, cfg)
+    with stage('analyze'):
+        analysis = analyze_ticker_data(ticker_data)
+        del ticker_data
+    with Writer(args.format) as out:
+        records = print_summary(analysis, cfg, out)
+    if records and cfg['title'] == 'congress':
+        # Keep the cache quick.py prints from up to date. Only congress: its
+        # records come from this script's own fetch, while insider input may
+        # be an old file or a replay (scrape.py caches live insider counts)
+        cache_sections({cfg['title']: records})
     
     try:
-        export_data(analysis, cfg)
+        with stage('export'):
+            export_data(analysis, cfg)
     except Exception as e:
         print(f"Error exporting data: {e}", file=sys.stderr)
         print("Summary analysis completed without data export.", file=sys.stderr)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Raw Page Archive
+Every page the scripts fetch is kept in a content-addressed archive so broken
+parsers can be debugged and history can be recomputed with new logic offline.
+
+Pages are stored once per distinct content under data/archive/objects/, named
+by their sha256 and compressed with zstd (if the zstandard package is
+installed) or gzip, so identical polls cost no space. data/archive/index.ndjson
+records the source, URL and fetch time of every fetch.
+
+Replay:
+    python scrape.py insider --replay                     # latest snapshot
+    python zacks.py --replay 2026-10-01T09:30             # newest at or before
+    python zacks.py --replay 2026-10-01                   # newest from that day or earlier
+    STONKS_REPLAY=latest ./run.sh                         # whole pipeline, CSVs to a temp dir
+
+Environment:
+    STONKS_ARCHIVE_DIR   where the archive lives (default: ../data/archive)
+    STONKS_ARCHIVE=0     don't archive fetched pages
+    STONKS_REPLAY        replay target, as set by --replay
+
+USAGE: python archive.py [--source SOURCE]    # list archived snapshots
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime, time, timedelta
+
+import requests
+
+from ratelimit import acquire
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_DIR = os.getenv('STONKS_ARCHIVE_DIR', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'archive'))
+ARCHIVE_ENV = 'STONKS_ARCHIVE'
+REPLAY_ENV = 'STONKS_REPLAY'
+
+# A partial and a complete snapshot fetched this close together come from the
+# same run, so the complete one holds the same data
+FETCH_WINDOW = timedelta(minutes=15)
+
+SOURCES = {
+    'quiverquant.com/congresstrading': 'congress',
+    'quiverquant.com/insiders': 'insider',
+    'zacks.com': 'zacks',
+}
+
+class ArchiveMiss(requests.exceptions.RequestException):
+    """No archived snapshot of a URL to replay; handled like a failed fetch."""
+
+def source_for(url):
+    """Name the source a URL belongs to, e.g. 'congress'."""
+    for fragment, source in SOURCES.items():
+        if fragment in url:
+            return source
+    return 'other'
+
+def archiving_enabled():
+    return os.getenv(ARCHIVE_ENV, '1').lower() not in ('0', 'off', 'false', 'no')
+
+def replay_target():
+    """The --replay target ('latest' or an ISO time), or None when live."""
+    return os.getenv(REPLAY_ENV) or None
+
+def _object_path(digest, ext):
+    return os.path.join(ARCHIVE_DIR, 'objects', digest[:2], f"{digest}.html.{ext}")
+
+def _compress(data):
+    if zstandard:
+        return zstandard.ZstdCompressor(level=10).compress(data), 'zst'
+    return gzip.compress(data, compresslevel=9), 'gz'
+
+def _decompress(data, ext):
+    if ext == 'zst':
+        if not zstandard:
+            raise ArchiveMiss("snapshot is zstd compressed but zstandard isn't installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def store(url, text, source=None, partial=False):
+    """
+    Archive one fetched page.
+
+    Args:
+        url: URL the page was fetched from
+        text: Page body
+        source: Source name (derived from the URL if omitted)
+        partial: True if reading stopped early (streaming fetches)
+
+    Returns:
+        sha256 hex digest of the page, or None if it couldn't be stored
+    """
+    data = text.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        existing = [ext for ext in ('zst', 'gz') if os.path.exists(_object_path(digest, ext))]
+        if existing:
+            ext = existing[0]
+        else:
+            blob, ext = _compress(data)
+            path = _object_path(digest, ext)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp, path)
+
+        entry = {
+            'hash': digest,
+            'ext': ext,
+            'source': source or source_for(url),
+            'url': url,
+            'fetched': datetime.now().isoformat(timespec='seconds'),
+            'bytes': len(data),
+        }
+        if partial:
+            entry['partial'] = True
+        with open(os.path.join(ARCHIVE_DIR, 'index.ndjson'), 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+        return digest
+    except OSError as e:
+        print(f"Warning: could not archive {url}: {e}", file=sys.stderr)
+        return None
+
+def read_index():
+    """Return every index entry, oldest first."""
+    try:
+        with open(os.path.join(ARCHIVE_DIR, 'index.ndjson')) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+def parse_when(text):
+    """
+    Parse a replay target: 'latest', or an ISO date or time.
+
+    A bare date means the end of that day, so '2026-10-01' replays the
+    newest snapshot fetched that day (or earlier).
+
+    Returns:
+        'latest' or a datetime
+
+    Raises:
+        ValueError: if text is neither
+    """
+    text = (text or '').strip()
+    if text == 'latest':
+        return text
+    try:
+        when = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"Replay target must be 'latest' or an ISO date/time like 2026-10-01T09:30, got {text!r}")
+    if 'T' not in text and ' ' not in text:
+        when = datetime.combine(when.date(), time.max)
+    return when
+
+def has_table(text, selector):
+    """True if text holds the opening and closing tags of the 'table.class1.class2' selector's table."""
+    tag, *classes = selector.strip().split('.')
+    tag = tag or 'table'
+    for match in re.finditer(rf'<{tag}\b[^>]*>', text, re.I):
+        attr = re.search(r'class\s*=\s*["\']([^"\']*)', match.group(0), re.I)
+        if attr and set(classes) <= set(attr.group(1).split()):
+            return re.search(rf'</{tag}\s*>', text[match.end():], re.I) is not None
+    return False
+
+def _read(entry):
+    with open(_object_path(entry['hash'], entry['ext']), 'rb') as f:
+        return _decompress(f.read(), entry['ext']).decode('utf-8')
+
+def find(url, when='latest', selector=None):
+    """
+    Newest index entry for url fetched at or before when ('latest' or ISO time).
+
+    A partial snapshot (a streamed read that stopped once the table ended)
+    gives way to a complete one from the same run (within FETCH_WINDOW).
+    Otherwise, with a selector, the newest snapshot whose body holds the whole
+    table wins; a partial one that was cut off earlier is skipped.
+    """
+    when = parse_when(when) if isinstance(when, str) else when
+    candidates = []
+    for entry in read_index():
+        if entry['url'] != url:
+            continue
+        fetched = datetime.fromisoformat(entry['fetched'])
+        if when != 'latest' and fetched > when:
+            continue
+        candidates.append((fetched, entry))
+    if not candidates:
+        return None
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+    newest_fetched, newest = candidates[0]
+    if not newest.get('partial'):
+        return newest
+    for fetched, entry in candidates:
+        if newest_fetched - fetched > FETCH_WINDOW:
+            break
+        if not entry.get('partial'):
+            return entry
+    if selector is None:
+        return newest
+    for fetched, entry in candidates:
+        if not entry.get('partial'):
+            return entry
+        try:
+            if has_table(_read(entry), selector):
+                return entry
+        except (OSError, ArchiveMiss):
+            continue
+    return newest
+
+def load(url, when='latest', selector=None):
+    """
+    Load an archived page.
+
+    Args:
+        url: URL of the page
+        when: 'latest' or an ISO time
+        selector: Table the caller wants, used to pass over cut-off snapshots (see find)
+
+    Raises:
+        ArchiveMiss: if there is no snapshot of url at or before when, or
+                     when isn't a valid replay target
+    """
+    try:
+        entry = find(url, when, selector)
+    except ValueError as e:
+        raise ArchiveMiss(str(e))
+    if entry is None:
+        raise ArchiveMiss(f"No archived snapshot of {url} at or before {when}")
+    try:
+        return _read(entry)
+    except OSError as e:
+        raise ArchiveMiss(f"Archived snapshot of {url} is unreadable: {e}")
+
+def fetch_html(url, headers=None, timeout=None, selector=None):
+    """
+    Fetch url's body as text: from the archive when replaying, otherwise
+    through the shared rate limiter, archiving what comes back.
+
+    selector names the table the caller is after; it only matters when
+    replaying (see find).
+
+    Raises:
+        requests.exceptions.RequestException (including ArchiveMiss)
+    """
+    when = replay_target()
+    if when:
+        return load(url, when, selector)
+
+    acquire(url)
+    resp = requests.get(url, headers=headers, timeout=timeout)
+    resp.raise_for_status()
+    text = resp.text
+    if archiving_enabled():
+        store(url, text)
+    return text
+
+def replay_argument(text):
+    """argparse type for --replay: validates the target and normalizes it to ISO."""
+    try:
+        when = parse_when(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return when if when == 'latest' else when.isoformat()
+
+def add_replay_argument(parser):
+    """Add the shared --replay option to an argparse parser."""
+    parser.add_argument('--replay', nargs='?', const='latest', metavar='WHEN', type=replay_argument,
+                        help='Re-run against archived pages instead of the network '
+                             '(latest, or an ISO time like 2026-10-01T09:30)')
+
+def apply_replay(args):
+    """Turn on replay for this process (and anything it runs) if --replay was given."""
+    if getattr(args, 'replay', None):
+        os.environ[REPLAY_ENV] = args.replay
+
+def main():
+    """List archived snapshots"""
+    parser = argparse.ArgumentParser(description='List archived page snapshots')
+    parser.add_argument('--source', '-s', help='Only show this source (congress, insider, zacks)')
+    args = parser.parse_args()
+
+    seen = set()
+    for entry in read_index():
+        if args.source and entry['source'] != args.source:
+            continue
+        dup = '' if entry['hash'] not in seen else ' (duplicate)'
+        seen.add(entry['hash'])
+        print(f"{entry['fetched']}  {entry['source']:<8}  {entry['hash'][:12]}  {entry['bytes']:>8}  {entry['url']}{dup}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+This script runs the congress, insider and Zacks pipelines against archived
+pages (see archive.py), reports time and peak memory per stage, and fails
+when a stage goes over its memory budget, so regressions get caught before
+they reach the small VPS the bot runs on
+
+USAGE: python bench.py                         # replay the latest snapshots
+       python bench.py --budget parse=32       # override a budget (MB)
+       python bench.py --live                  # fetch instead of replaying
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import memtrack
+from archive import REPLAY_ENV, ArchiveMiss
+from analyzer import analyze_ticker_data, export_data, CONFIG
+from congress_df import get_congress_dataframe
+from scrape import CONFIG as SCRAPE_CONFIG
+from scraper import fetch_table, count_transactions
+from zacks import ZACKS_URL, fetch_page_content, extract_zacks_tickers, extract_top_movers
+
+# Peak memory budgets per stage, in MB
+BUDGETS = {
+    'fetch': 16,
+    'parse': 64,
+    'extract': 16,
+    'analyze': 16,
+    'export': 8,
+}
+
+def run_pipelines(tmpdir):
+    """Run every pipeline once, returning (name, seconds) per pipeline."""
+    timings = []
+    for source in ('congress', 'insider'):
+        started = time.perf_counter()
+        cfg = SCRAPE_CONFIG[source]
+        table = fetch_table(cfg['url'], cfg['selector'])
+        with memtrack.stage('extract'):
+            counts = count_transactions(table, cfg['ticker_extractor'], cfg['sale_detector'](table))
+        del table
+        with memtrack.stage('analyze'):
+            analysis = analyze_ticker_data([
+                {'ticker': ticker, 'purchases': purchases}
+                for ticker, (sales, purchases) in counts.items()
+            ])
+        with memtrack.stage('export'):
+            export_data(analysis, {**CONFIG[source], 'csv': os.path.join(tmpdir, f"{source}.csv")})
+        timings.append((source, time.perf_counter() - started))
+
+    started = time.perf_counter()
+    df = get_congress_dataframe(purchases_only=True, sort_by_recent_purchases=True)
+    with memtrack.stage('export'):
+        df.to_csv(os.path.join(tmpdir, 'congress_purchases_only.csv'), index=False)
+    timings.append(('congress_df', time.perf_counter() - started))
+
+    started = time.perf_counter()
+    html_content = fetch_page_content(ZACKS_URL)
+    if html_content:
+        extract_zacks_tickers(html_content)
+        extract_top_movers(html_content)
+    timings.append(('zacks', time.perf_counter() - started))
+    return timings
+
+def parse_budget(text):
+    name, _, mb = text.partition('=')
+    try:
+        return name.strip(), float(mb)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected STAGE=MB, got {text!r}")
+
+def main():
+    """Main function to run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark the pipelines and check memory budgets')
+    parser.add_argument('--budget', '-b', type=parse_budget, action='append', default=[],
+                        metavar='STAGE=MB', help='Override a stage budget, e.g. parse=32')
+    parser.add_argument('--live', action='store_true', help='Fetch pages instead of replaying the archive')
+    args = parser.parse_args()
+
+    if not args.live:
+        os.environ.setdefault(REPLAY_ENV, 'latest')
+    memtrack.enable(report=False)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            timings = run_pipelines(tmpdir)
+        except ArchiveMiss as e:
+            print(f"Error: {e}", file=sys.stderr)
+            print("Archive some pages first (run ./run.sh once) or pass --live.", file=sys.stderr)
+            sys.exit(1)
+
+    print("--- Time Per Pipeline ---")
+    for name, seconds in timings:
+        print(f"{name:<12} {seconds * 1000:.1f} ms")
+    memtrack.print_report(sys.stdout)
+
+    budgets = dict(BUDGETS)
+    budgets.update(args.budget)
+    try:
+        memtrack.check_budgets({name: mb * 1024 * 1024 for name, mb in budgets.items()})
+    except memtrack.MemoryBudgetExceeded as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    print("All stages within budget.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Thin client for the local stonks query service (service.py).
+
+When STONKS_SERVICE is set (e.g. http://127.0.0.1:8765), scripts ask the
+service for its in-memory results before scraping anything themselves.
+Any failure returns None so callers fall back to fetching directly.
+"""
+import json
+import os
+from urllib.parse import urlencode, quote
+from urllib.request import urlopen
+
+SERVICE_ENV = 'STONKS_SERVICE'
+
+# Same variable archive.py sets for --replay; not imported to keep this module dependency-free
+REPLAY_ENV = 'STONKS_REPLAY'
+
+# The service answers from memory, so anything slower than this is broken
+TIMEOUT = 2
+
+def service_url():
+    """Base URL of the query service, or None if none is configured."""
+    if os.getenv(REPLAY_ENV):
+        # Replays must re-run the local logic on archived pages
+        return None
+    url = os.getenv(SERVICE_ENV, '').strip()
+    return url.rstrip('/') or None
+
+def query(path, **params):
+    """
+    GET a JSON document from the query service.
+
+    Args:
+        path: Endpoint path, e.g. '/top' or '/ticker/NVDA'
+        **params: Query string parameters
+
+    Returns:
+        Decoded JSON, or None if no service is configured or it can't answer
+    """
+    base = service_url()
+    if not base:
+        return None
+    url = base + quote(path)
+    if params:
+        url += '?' + urlencode({k: v for k, v in params.items() if v is not None})
+    try:
+        with urlopen(url, timeout=TIMEOUT) as resp:
+            return json.loads(resp.read().decode('utf-8'))
+    except Exception:
+        return None
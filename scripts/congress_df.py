@@ -5,26 +5,41 @@ This script fetches the congress trading table from QuiverQuant and converts it
 to a pandas DataFrame with key information about each transaction
 """
 import argparse
+import sys
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
+from archive import fetch_html, add_replay_argument, apply_replay, replay_target
 from datetime import datetime
+from client import query
+from stream import stream_congress_data
+from scraper import select_table
+from memtrack import stage
+from output import Writer, add_format_argument
+from rowfilter import RowFilter, filter_congress_rows
+import portfolio
 
 def fetch_table(url, selector):
     """Fetch HTML table from URL"""
     try:
-        resp = requests.get(url)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        return soup.select_one(selector)
+        with stage('fetch'):
+            html = fetch_html(url, selector=selector)
+        with stage('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
+            del html
+            return select_table(soup, selector)
     except Exception as e:
-        print(f"Error fetching table: {e}")
+        print(f"Error fetching table: {e}", file=sys.stderr)
         return None
 
-def extract_congress_data(table):
+def extract_congress_data(table, filters=None):
     """
     Extract data from congress trading table into structured format.
     
+    Args:
+        table: BeautifulSoup table element
+        filters: Optional RowFilter; rows it rejects are skipped before the
+                 rest of their cells are read
+    
     Returns:
         List of dictionaries containing transaction data
     """
@@ -43,6 +58,18 @@ def extract_congress_data(table):
             if len(cells) < 5:  # Ensure we have enough cells
                 continue
                 
+            # Extract transaction type
+            transaction_span = cells[1].find('span')
+            transaction = transaction_span.get_text(strip=True) if transaction_span else None
+            
+            # Extract trade date
+            trade_date = cells[4].get_text(strip=True)
+            
+            # Check the cheap filters before reading the rest of the row
+            if filters and not (filters.accepts_transaction(transaction)
+                                and filters.accepts_date(trade_date)):
+                continue
+            
             # Extract ticker
             ticker_span = (cells[0].find('span', class_='positive') or 
                           cells[0].find('span', class_='negative') or 
@@ -50,10 +77,8 @@ def extract_congress_data(table):
             ticker = ticker_span.get_text(strip=True) if ticker_span else None
             if ticker == '-' or not ticker:
                 continue
-                
-            # Extract transaction type
-            transaction_span = cells[1].find('span')
-            transaction = transaction_span.get_text(strip=True) if transaction_span else None
+            if filters and not filters.accepts_ticker(ticker):
+                continue
             
             # Extract politician name
             politician = cells[2].get_text(strip=True)
@@ -61,9 +86,6 @@ def extract_congress_data(table):
             # Extract filing date
             filed_date = cells[3].get_text(strip=True)
             
-            # Extract trade date
-            trade_date = cells[4].get_text(strip=True)
-            
             # Create data entry
             entry = {
                 'Stock': ticker,
@@ -76,53 +98,127 @@ def extract_congress_data(table):
             data.append(entry)
             
         except Exception as e:
-            print(f"Error parsing row: {e}")
+            print(f"Error parsing row: {e}", file=sys.stderr)
             continue
             
     return data
 
-def get_congress_dataframe(purchases_only=False, sort_by_recent_purchases=False):
+def get_congress_rows(stream=False, filters=None):
+    """
+    Fetch congress trading rows from the query service when one is running,
+    otherwise from QuiverQuant
+    
+    Args:
+        stream (bool): If True, parse rows while the page downloads instead of
+                       building the whole page first
+        filters (RowFilter): Only keep rows that pass, rejecting them while
+                             the table is decoded
+    
+    Returns:
+        List of dictionaries containing transaction data
+    """
+    url = 'https://www.quiverquant.com/congresstrading/'
+    selector = 'table.table-congress.table-politician'
+    
+    data = query('/congress')
+    if data is not None and filters:
+        data = list(filter_congress_rows(data, filters))
+    if data is None and stream:
+        try:
+            data = stream_congress_data(url, selector, filters=filters)
+        except Exception as e:
+            print(f"Error fetching table: {e}", file=sys.stderr)
+            data = []
+    if data is None:
+        table = fetch_table(url, selector)
+        with stage('extract'):
+            data = extract_congress_data(table, filters)
+        del table
+    return data
+
+def get_congress_dataframe(purchases_only=False, sort_by_recent_purchases=False, data=None, stream=False):
     """
     Fetch congress trading data and return as DataFrame
     
     Args:
         purchases_only (bool): If True, filter out all sales transactions
         sort_by_recent_purchases (bool): If True, sort by most recent purchases first
+        data (list): Rows from extract_congress_data. If omitted they come from
+                     the query service when one is running, otherwise from QuiverQuant.
+        stream (bool): If True, parse rows while the page downloads instead of
+                       building the whole page first
         
     Returns:
         pandas.DataFrame: Congress trading data
     """
-    url = 'https://www.quiverquant.com/congresstrading/'
-    selector = 'table.table-congress.table-politician'
-    
-    table = fetch_table(url, selector)
-    data = extract_congress_data(table)
+    filters = RowFilter(action='purchase') if purchases_only else None
+    if data is None:
+        data = get_congress_rows(stream=stream, filters=filters)
+    elif filters:
+        data = list(filter_congress_rows(data, filters))
     
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
-    
-    # Additional processing
-    if not df.empty:
-        # Convert dates to datetime if needed
-        for date_col in ['Filed', 'Traded']:
+    with stage('analyze'):
+        # Convert to DataFrame
+        df = pd.DataFrame(data)
+        del data
+        
+        # Additional processing
+        if not df.empty:
+            # Remove the Filed column before any copies of the frame are made
+            df.drop(columns=['Filed'], inplace=True)
+            
+            # Convert dates to datetime if needed
             try:
-                df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+                df['Traded'] = pd.to_datetime(df['Traded'], errors='coerce')
             except:
                 pass
-        
-        # Filter out sales if requested
-        if purchases_only:
-            df = df[df['Transaction'].str.contains('Purchase', case=False, na=False)]
-        
-        # Remove the Filed column
-        df = df.drop(columns=['Filed'])
-        
-        # Sort by most recent trades first if requested
-        if sort_by_recent_purchases and not df.empty:
-            df = df.sort_values(by='Traded', ascending=False)
+            
+            # Sort by most recent trades first if requested
+            if sort_by_recent_purchases and not df.empty:
+                df = df.sort_values(by='Traded', ascending=False)
     
     return df
 
+def update_portfolio_index(rows):
+    """
+    Merge scraped rows and any new history snapshots into the saved portfolio index
+    
+    Replayed rows are merged into the returned index but never saved, so old
+    archived pages can't leak into data/portfolio_index.json.
+    """
+    index = portfolio.load_index()
+    keys = portfolio.trade_keys(index)
+    added = portfolio.add_trades(index, rows, keys) + portfolio.ingest_history(index, keys=keys)
+    if added and not replay_target():
+        try:
+            portfolio.save_index(index)
+        except OSError as e:
+            print(f"Warning: could not save portfolio index: {e}", file=sys.stderr)
+    return index
+
+def lookup(args):
+    """Answer --politician/--ticker from the portfolio index"""
+    # A plain lookup only reads the saved index; scraping and merging history is for --refresh
+    if args.refresh:
+        index = update_portfolio_index(get_congress_rows(stream=args.stream))
+    else:
+        index = portfolio.load_index()
+    if not index['trades']:
+        # Nothing saved yet, so build the index from a scrape once
+        index = update_portfolio_index(get_congress_rows(stream=args.stream))
+    
+    with Writer(args.format) as out:
+        if args.politician:
+            trades = None if args.refresh else query('/politician', name=args.politician)
+            if trades is None:
+                trades = portfolio.lookup_politician(index, args.politician)
+            out.section(f"Congress Trades by {args.politician}", trades,
+                        lambda t: f"{out.link(t['ticker'])}    {t['transaction']}    {t['politician']} {t['traded']}")
+        if args.ticker:
+            trades = portfolio.lookup_ticker(index, args.ticker)
+            out.section(f"Congress Trades in {args.ticker.upper()}", trades,
+                        lambda t: f"{t['politician']}    {t['transaction']}    {t['traded']}")
+
 def main():
     """Main function to run the script"""
     parser = argparse.ArgumentParser(description='Extract Congress trading data to DataFrame')
@@ -132,33 +228,59 @@ def main():
                         help='Filter out all sales transactions')
     parser.add_argument('--recent-first', '-r', action='store_true', 
                         help='Sort by most recent trades first')
+    parser.add_argument('--stream', '-s', action='store_true',
+                        help='Parse rows while the page downloads and stop once the table ends')
+    parser.add_argument('--politician', metavar='NAME',
+                        help='Show trades by a politician from the portfolio index (partial names match)')
+    parser.add_argument('--ticker', '-t', help='Show which politicians traded a ticker, from the portfolio index')
+    parser.add_argument('--refresh', action='store_true',
+                        help='With --politician/--ticker, scrape first instead of only using the saved index')
+    add_format_argument(parser)
+    add_replay_argument(parser)
     args = parser.parse_args()
+    apply_replay(args)
+    if args.politician is not None and not args.politician.strip():
+        parser.error("--politician needs a name")
     
-    print("Fetching Congress trading data...")
-    df = get_congress_dataframe(
-        purchases_only=args.purchases_only,
-        sort_by_recent_purchases=args.recent_first
-    )
+    if args.politician or args.ticker:
+        return lookup(args)
     
-    if df.empty:
-        print("No data found or error occurred.")
-        return
+    with Writer(args.format) as out:
+        out.message("Fetching Congress trading data...")
+        rows = get_congress_rows(stream=args.stream)
+        update_portfolio_index(rows)
+        df = get_congress_dataframe(
+            purchases_only=args.purchases_only,
+            sort_by_recent_purchases=args.recent_first,
+            data=rows
+        )
+        del rows
         
-    print(f"Retrieved {len(df)} Congress trading records.")
-    
-    if args.purchases_only:
-        print("Showing purchases only (sales filtered out).")
-    
-    if args.recent_first:
-        print("Data sorted with most recent trades at the top.")
-    
-    if args.preview:
-        print("\nPreview of data:")
-        print(df.head(10))
-    
-    if args.output:
-        df.to_csv(args.output, index=False)
-        print(f"Data saved to {args.output}")
+        if df.empty:
+            out.message("No data found or error occurred.")
+            return
+            
+        out.message(f"Retrieved {len(df)} Congress trading records.")
+        
+        if args.purchases_only:
+            out.message("Showing purchases only (sales filtered out).")
+        
+        if args.recent_first:
+            out.message("Data sorted with most recent trades at the top.")
+        
+        shown = df.head(10) if args.preview else df
+        if out.structured:
+            # The rows themselves are the output; --preview keeps the first 10
+            records = shown.assign(Traded=shown['Traded'].dt.strftime('%Y-%m-%d').fillna(''))
+            out.section("Congress Trades", records.to_dict('records'))
+        elif args.preview:
+            out.write("\nPreview of data:\n")
+            out.write(f"{shown}\n")
+        
+        if args.output:
+            with stage('export'):
+                df.to_csv(args.output, index=False)
+            out.message(f"Data saved to {args.output}")
     
     return df
 
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Historical CSV Scanner
+This script scans every daily insider and congress CSV that run.sh (data/MM-DD-YYYY/)
+and run.ps1 (data/qq/MM-dd-yyyy_HH-mm-ss/) have saved, in parallel, and reports
+the max purchases per day, the overall top purchases and per-ticker totals
+"""
+import argparse
+import csv
+import glob
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from output import Writer, add_format_argument
+
+PATTERNS = {
+    'insider': 'insider_trading_data*.csv',
+    'congress': 'congress_trading_data*.csv',
+}
+
+# Only these columns are kept from a snapshot
+USECOLS = ['ticker', 'purchases']
+
+# Below this many files, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 32
+
+def discover_csvs(data_dir, pattern):
+    """Find snapshot CSVs matching pattern in both run.sh and run.ps1 layouts."""
+    paths = glob.glob(os.path.join(data_dir, '*', pattern))
+    paths += glob.glob(os.path.join(data_dir, 'qq', '*', pattern))
+    return sorted(paths)
+
+def snapshot_day(path):
+    """MM-DD-YYYY day of a snapshot, taken from its directory name."""
+    return os.path.basename(os.path.dirname(path))[:10]
+
+def parse_day(day):
+    """Parse a MM-DD-YYYY day, or None if the directory isn't named that way."""
+    try:
+        return datetime.strptime(day, "%m-%d-%Y")
+    except ValueError:
+        return None
+
+def snapshot_date(path):
+    """Date of a snapshot, falling back to the file's mtime."""
+    return parse_day(snapshot_day(path)) or datetime.fromtimestamp(os.path.getmtime(path))
+
+def scan_file(path):
+    """
+    Scan one snapshot CSV, keeping only the ticker and purchases columns.
+
+    The csv module is used instead of pandas because importing pandas alone
+    costs more than scanning a year of snapshots.
+
+    Returns:
+        tuple of (path, list of (ticker, purchases) rows) or (path, None) on error
+    """
+    rows = []
+    try:
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            ticker_col, purchases_col = (header.index(name) for name in USECOLS)
+            width = max(ticker_col, purchases_col)
+            for record in reader:
+                if len(record) <= width:
+                    continue
+                try:
+                    rows.append((record[ticker_col], int(float(record[purchases_col]))))
+                except ValueError:
+                    continue
+    except Exception as e:
+        print(f"Warning: skipping {path} - {e}", file=sys.stderr)
+        return path, None
+    return path, rows
+
+def scan_all(paths, jobs=None):
+    """Scan paths, fanning out to a process pool when there are enough of them."""
+    if len(paths) < MIN_PARALLEL_FILES or jobs == 1:
+        return [scan_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunksize = max(1, len(paths) // ((jobs or os.cpu_count() or 1) * 4))
+        return list(pool.map(scan_file, paths, chunksize=chunksize))
+
+def summarize(results, top_n):
+    """
+    Reduce per-file scan results.
+
+    Returns:
+        dict with 'daily_max' (day -> (ticker, purchases)), 'top' (list of
+        (purchases, ticker, day)) and 'totals' (ticker -> total purchases)
+    """
+    daily_max = {}
+    totals = defaultdict(int)
+    best = []
+
+    for path, rows in results:
+        if not rows:
+            continue
+        day = snapshot_day(path)
+        for ticker, purchases in rows:
+            totals[ticker] += purchases
+            if day not in daily_max or purchases > daily_max[day][1]:
+                daily_max[day] = (ticker, purchases)
+            best.append((purchases, ticker, day))
+
+    best.sort(key=lambda item: (-item[0], item[1], item[2]))
+    return {
+        'daily_max': daily_max,
+        'top': best[:top_n],
+        'totals': dict(totals),
+    }
+
+def print_report(out, source, summary, top_n):
+    """Print the per-day maxima, overall top-N and per-ticker totals."""
+    name = source.capitalize()
+    days = sorted(summary['daily_max'], key=lambda d: (parse_day(d) or datetime.max, d))
+    out.section(f"Max {name} Purchases Per Day", [
+        {'day': day, 'ticker': summary['daily_max'][day][0], 'purchases': summary['daily_max'][day][1]}
+        for day in days
+    ], lambda r: f"{r['day']}: {r['ticker']} {r['purchases']}")
+
+    out.section(f"Top {top_n} {name} Purchases", [
+        {'ticker': ticker, 'purchases': purchases, 'day': day}
+        for purchases, ticker, day in summary['top']
+    ], lambda r: f"{r['ticker']} {r['purchases']} ({r['day']})")
+
+    totals = sorted(summary['totals'].items(), key=lambda item: (-item[1], item[0]))
+    out.section(f"{name} Purchases By Ticker", [
+        {'ticker': ticker, 'purchases': purchases}
+        for ticker, purchases in totals[:top_n]
+    ], lambda r: f"{r['ticker']} {r['purchases']}")
+
+def main():
+    """Main function to run the script"""
+    default_data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+    parser = argparse.ArgumentParser(description='Scan saved daily trading CSVs')
+    parser.add_argument('source', nargs='?', choices=list(PATTERNS) + ['all'], default='insider',
+                        help='Which snapshots to scan (default: insider)')
+    parser.add_argument('--data-dir', '-d', default=default_data_dir,
+                        help='Directory run.sh saves snapshots in (default: ../data)')
+    parser.add_argument('--top', '-n', type=int, default=10, help='Number of tickers to report')
+    parser.add_argument('--jobs', '-j', type=int, help='Worker processes (default: one per CPU)')
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    sources = list(PATTERNS) if args.source == 'all' else [args.source]
+    with Writer(args.format) as out:
+        for source in sources:
+            paths = discover_csvs(args.data_dir, PATTERNS[source])
+            if not paths:
+                print(f"No {source} CSVs found in {args.data_dir}", file=sys.stderr)
+                continue
+            summary = summarize(scan_all(paths, args.jobs), args.top)
+            print_report(out, source, summary, args.top)
+
+if __name__ == '__main__':
+    main()
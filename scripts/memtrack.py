@@ -0,0 +1,118 @@
+"""
+Opt-in peak-memory accounting per pipeline stage.
+
+Set STONKS_MEMTRACK=1 and every stage (fetch, parse, extract, analyze,
+export) records how far traced memory rose above where it started, using
+tracemalloc. The peaks are printed to stderr when the process exits.
+Without the variable, stage() does nothing and costs nothing.
+
+Usage:
+    from memtrack import stage
+    with stage('parse'):
+        soup = BeautifulSoup(html, 'html.parser')
+
+bench.py turns tracking on itself and checks the peaks against budgets.
+"""
+import atexit
+import os
+import sys
+import tracemalloc
+from contextlib import contextmanager
+
+MEMTRACK_ENV = 'STONKS_MEMTRACK'
+
+STAGES = ['fetch', 'parse', 'extract', 'analyze', 'export']
+
+# stage name -> highest peak (bytes above the stage's starting point) seen
+PEAKS = {}
+
+_stack = []
+_reporting = False
+
+class MemoryBudgetExceeded(AssertionError):
+    """A stage's peak memory went over its budget."""
+
+def enabled():
+    return os.getenv(MEMTRACK_ENV, '').lower() not in ('', '0', 'off', 'false', 'no')
+
+def enable(report=True):
+    """
+    Turn tracking on for this process (and anything it runs).
+
+    Pass report=False when the caller prints the report itself.
+    """
+    global _reporting
+    os.environ[MEMTRACK_ENV] = '1'
+    if not report:
+        _reporting = True
+    _start()
+
+def _start():
+    global _reporting
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if not _reporting:
+        _reporting = True
+        atexit.register(print_report)
+
+@contextmanager
+def stage(name):
+    """Record the peak memory used while the block runs under name."""
+    if not enabled():
+        yield
+        return
+
+    _start()
+    # The peak counter is global, so fold the enclosing stage's peak so far
+    # into it before resetting for this one
+    current, peak = tracemalloc.get_traced_memory()
+    if _stack:
+        _stack[-1][1] = max(_stack[-1][1], peak)
+    tracemalloc.reset_peak()
+    frame = [current, current]
+    _stack.append(frame)
+    try:
+        yield
+    finally:
+        _stack.pop()
+        peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+        PEAKS[name] = max(PEAKS.get(name, 0), peak - frame[0])
+        if _stack:
+            _stack[-1][1] = max(_stack[-1][1], peak)
+
+def format_bytes(n):
+    for unit in ('B', 'KB', 'MB'):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+def print_report(file=None):
+    """Print each stage's peak memory."""
+    if not PEAKS:
+        return
+    file = file or sys.stderr
+    order = [s for s in STAGES if s in PEAKS] + sorted(s for s in PEAKS if s not in STAGES)
+    print("--- Peak Memory Per Stage ---", file=file)
+    for name in order:
+        print(f"{name:<10} {format_bytes(PEAKS[name])}", file=file)
+
+def check_budgets(budgets, peaks=None):
+    """
+    Compare recorded peaks against budgets.
+
+    Args:
+        budgets: dict mapping stage name -> max bytes
+        peaks: Peaks to check (defaults to everything recorded so far)
+
+    Raises:
+        MemoryBudgetExceeded: listing every stage over budget
+    """
+    peaks = PEAKS if peaks is None else peaks
+    over = [
+        f"{name}: {format_bytes(peaks[name])} > {format_bytes(limit)}"
+        for name, limit in budgets.items()
+        if peaks.get(name, 0) > limit
+    ]
+    if over:
+        raise MemoryBudgetExceeded("Memory budget exceeded - " + "; ".join(over))
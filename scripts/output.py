@@ -0,0 +1,133 @@
+"""
+Shared output formats for the CLIs.
+
+Every script hands its results to a Writer as titled sections of records
+(plain dicts). The Writer renders them as:
+    tty     - the classic '--- Title ---' listing with clickable ticker links
+    plain   - the same listing without escape codes (default when piped)
+    json    - one JSON array of {"title": ..., "records": [...]} sections
+    ndjson  - one JSON object per record, tagged with its section title
+    csv     - one CSV table, with a 'section' column
+
+Output is collected in memory and written with a single call when the Writer
+closes (or every BUFFER_SIZE characters), instead of one syscall per line.
+"""
+import csv
+import io
+import json
+import sys
+
+FORMATS = ['tty', 'plain', 'json', 'ndjson', 'csv']
+
+BUFFER_SIZE = 1 << 16
+
+def add_format_argument(parser):
+    """Add the shared --format option to an argparse parser."""
+    parser.add_argument('--format', '-F', choices=FORMATS, default=None,
+                        help='Output format (default: tty on a terminal, plain otherwise)')
+
+def resolve_format(fmt=None, stream=None):
+    """Pick tty or plain from the stream when no format was requested."""
+    if fmt:
+        return fmt
+    stream = stream or sys.stdout
+    return 'tty' if hasattr(stream, 'isatty') and stream.isatty() else 'plain'
+
+def yahoo_link(ticker):
+    """OSC 8 terminal hyperlink from a ticker to its Yahoo Finance quote page."""
+    clean_ticker = ticker.strip()
+    url = f"https://finance.yahoo.com/quote/{clean_ticker}"
+    # OSC 8 escape sequence format for terminal hyperlinks
+    # Format: \033]8;;URL\033\\TEXT\033]8;;\033\\
+    return f"\033]8;;{url}\033\\{clean_ticker}\033]8;;\033\\"
+
+class Writer:
+    """
+    Buffered, format-aware writer for CLI results.
+
+    Usage:
+        with Writer(args.format) as out:
+            out.section("Zacks #1 Rank Additions", records, lambda r: out.link(r['ticker']))
+    """
+
+    def __init__(self, fmt=None, stream=None):
+        self.stream = stream or sys.stdout
+        self.format = resolve_format(fmt, self.stream)
+        self.buffer = io.StringIO()
+        self.sections = []
+
+    @property
+    def structured(self):
+        return self.format in ('json', 'ndjson', 'csv')
+
+    def link(self, ticker):
+        """Clickable ticker on a terminal, the bare ticker everywhere else."""
+        return yahoo_link(ticker) if self.format == 'tty' else ticker.strip()
+
+    def write(self, text):
+        self.buffer.write(text)
+        if self.buffer.tell() >= BUFFER_SIZE:
+            self.flush()
+
+    def message(self, text):
+        """Status text: shown inline for humans, sent to stderr for structured formats."""
+        if self.structured:
+            print(text.strip(), file=sys.stderr)
+        else:
+            self.write(text + "\n")
+
+    def section(self, title, records, line=None):
+        """
+        Emit a titled list of records.
+
+        Args:
+            title: Section title, shown as '--- title ---' in tty/plain
+            records: List of dicts
+            line: Function rendering one record as a tty/plain line
+                  (defaults to the record's ticker link)
+        """
+        records = list(records)
+        if self.format == 'json':
+            self.sections.append({'title': title, 'records': records})
+        elif self.format == 'ndjson':
+            for record in records:
+                self.write(json.dumps({'section': title, **record}, default=str) + "\n")
+        elif self.format == 'csv':
+            self.sections.append({'title': title, 'records': records})
+        else:
+            line = line or (lambda record: self.link(record['ticker']))
+            self.write(f"--- {title} ---\n")
+            for record in records:
+                self.write(line(record) + "\n")
+
+    def close(self):
+        if self.format == 'json':
+            self.buffer.write(json.dumps(self.sections, default=str) + "\n")
+        elif self.format == 'csv':
+            self._write_csv()
+        self.sections = []
+        self.flush()
+
+    def _write_csv(self):
+        fields = ['section']
+        for section in self.sections:
+            for record in section['records']:
+                fields.extend(k for k in record if k not in fields)
+        writer = csv.DictWriter(self.buffer, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        for section in self.sections:
+            for record in section['records']:
+                writer.writerow({'section': section['title'], **record})
+
+    def flush(self):
+        data = self.buffer.getvalue()
+        if data:
+            self.stream.write(data)
+            self.stream.flush()
+        self.buffer = io.StringIO()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
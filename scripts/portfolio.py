@@ -0,0 +1,152 @@
+"""
+Per-politician portfolio index.
+
+Congress trades are kept in an inverted index (politician -> trades and
+ticker -> trades) saved to data/portfolio_index.json. Every congress_df.py
+scrape merges its rows in, and the congress_purchases_only_*.csv snapshots
+run.sh saves are ingested incrementally (each file only once), so lookups
+are a dict hit instead of a re-scrape and DataFrame filter.
+
+Usage:
+    python congress_df.py --politician pelosi
+    python congress_df.py --ticker NVDA
+"""
+import json
+import os
+import sys
+
+import pandas as pd
+
+from history import discover_csvs
+from rowfilter import normalize_date
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+INDEX_PATH = os.path.join(DATA_DIR, 'portfolio_index.json')
+
+HISTORY_PATTERN = 'congress_purchases_only*.csv'
+
+def new_index():
+    return {'files': [], 'trades': [], 'politicians': {}, 'tickers': {}}
+
+def trade_key(trade):
+    return (trade['politician'].lower(), trade['ticker'], (trade['transaction'] or '').lower(), trade['traded'])
+
+def trade_keys(index):
+    """Keys of every trade in the index, for passing to add_trades and ingest_history."""
+    return {trade_key(trade) for trade in index['trades']}
+
+def add_trades(index, rows, keys=None):
+    """
+    Merge congress rows (extract_congress_data format) into the index.
+
+    Trades already in the index are skipped, so re-ingesting overlapping
+    scrapes is safe.
+
+    Args:
+        keys: Set from trade_keys(index), updated in place; pass it in when
+              merging more than once so it's only built once
+
+    Returns:
+        Number of new trades added
+    """
+    if keys is None:
+        keys = trade_keys(index)
+    added = 0
+    for row in rows:
+        ticker = (row.get('Stock') or '').strip().upper()
+        politician = (row.get('Politician') or '').strip()
+        if not ticker or ticker == '-' or not politician:
+            continue
+        trade = {
+            'politician': politician,
+            'ticker': ticker,
+            'transaction': row.get('Transaction'),
+            'traded': normalize_date(row.get('Traded')),
+        }
+        key = trade_key(trade)
+        if key in keys:
+            continue
+        keys.add(key)
+        position = len(index['trades'])
+        index['trades'].append(trade)
+        index['politicians'].setdefault(politician.lower(), []).append(position)
+        index['tickers'].setdefault(ticker, []).append(position)
+        added += 1
+    return added
+
+def ingest_history(index, data_dir=DATA_DIR, keys=None):
+    """
+    Merge congress snapshot CSVs that haven't been ingested yet.
+
+    Args:
+        keys: Set from trade_keys(index); built here only if a new file turns up
+    """
+    seen = set(index['files'])
+    added = 0
+    for path in discover_csvs(data_dir, HISTORY_PATTERN):
+        name = os.path.relpath(path, data_dir)
+        if name in seen:
+            continue
+        try:
+            df = pd.read_csv(path, usecols=['Stock', 'Transaction', 'Politician', 'Traded'], dtype=str)
+        except Exception as e:
+            print(f"Warning: skipping {path} - {e}", file=sys.stderr)
+            continue
+        if keys is None:
+            keys = trade_keys(index)
+        added += add_trades(index, df.fillna('').to_dict('records'), keys)
+        index['files'].append(name)
+    return added
+
+def load_index(path=INDEX_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return new_index()
+    except ValueError as e:
+        print(f"Warning: rebuilding unreadable index {path} - {e}", file=sys.stderr)
+        return new_index()
+
+def save_index(index, path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+def build_index(rows):
+    """Build a fresh in-memory index from congress rows."""
+    index = new_index()
+    add_trades(index, rows)
+    return index
+
+def _trades(index, positions):
+    trades = [index['trades'][i] for i in positions]
+    return sorted(trades, key=lambda trade: trade['traded'], reverse=True)
+
+def lookup_politician(index, name):
+    """
+    Trades by a politician, most recent first.
+
+    An exact (case-insensitive) name is a single dict hit; anything else
+    matches as a substring of the politician's name.
+
+    Raises:
+        ValueError: if name is blank, which would match every politician
+    """
+    name = (name or '').strip().lower()
+    if not name:
+        raise ValueError("politician name must not be empty")
+    positions = index['politicians'].get(name)
+    if positions is None:
+        positions = [
+            i
+            for politician, hits in index['politicians'].items() if name in politician
+            for i in hits
+        ]
+    return _trades(index, positions)
+
+def lookup_ticker(index, ticker):
+    """Trades of a ticker by every politician, most recent first."""
+    return _trades(index, index['tickers'].get(ticker.strip().upper(), []))
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Instant Picks
+This script prints the last cached Zacks, congress and insider picks straight
+away, labeled with how old they are, then refreshes all three in the
+background and prints what changed, so there is something to read while the
+network fetches run
+
+The cache is data/quick_cache.json, holding the records print_summary and the
+Zacks extractors produce. zacks.py, scrape.py insider and analyzer.py congress
+update it on every live run, and so does this script after each refresh.
+
+With --format json or csv, the cached picks and the changes are written as
+two separate documents, so the cached one can be read before the refresh.
+
+USAGE: python quick.py                 # cached picks now, then the changes
+       python quick.py --cached        # cached picks only, no network
+       ./run.sh --quick
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from output import Writer, add_format_argument
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'quick_cache.json')
+
+# Same variable archive.py sets for --replay; replayed pages aren't cached
+REPLAY_ENV = 'STONKS_REPLAY'
+
+# Cached sections, in display order. key lists the fields that identify a
+# record when diffing; any other field that differs is reported as a change.
+SECTIONS = {
+    'zacks_additions': {'title': 'Zacks #1 Rank Additions', 'key': ('ticker',)},
+    'zacks_top_movers': {'title': 'Zacks #1 Rank Top Movers', 'key': ('ticker',)},
+    'insider': {'title': 'Recent Insider Purchases', 'key': ('ticker',)},
+    'congress': {'title': 'Recent Congress Purchases', 'key': ('ticker', 'politician', 'traded')},
+}
+
+def load_cache(path=CACHE_PATH):
+    """Return {section: {'saved': iso time, 'records': [...]}}, empty if there's no cache."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        print(f"Warning: ignoring unreadable cache {path} - {e}", file=sys.stderr)
+        return {}
+
+def cache_sections(sections, path=CACHE_PATH):
+    """
+    Save fresh records for some sections, keeping the others as they were.
+
+    Args:
+        sections: dict mapping section name (see SECTIONS) -> list of records
+    """
+    if os.getenv(REPLAY_ENV):
+        return
+    cache = load_cache(path)
+    saved = datetime.now().isoformat(timespec='seconds')
+    for name, records in sections.items():
+        cache[name] = {'saved': saved, 'records': records}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(cache, f, separators=(',', ':'), default=str)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: could not save cache {path}: {e}", file=sys.stderr)
+
+def format_age(saved, now=None):
+    """'45s', '12m', '3h' or '2d' since an ISO timestamp."""
+    now = now or datetime.now()
+    seconds = max(0, int((now - datetime.fromisoformat(saved)).total_seconds()))
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+def format_record(out, record):
+    """One record as a terminal line: the ticker link plus any other fields."""
+    rest = [str(value) for field, value in record.items() if field != 'ticker']
+    return '    '.join([out.link(record['ticker'])] + rest)
+
+def print_cached(out, cache):
+    """Print every cached section with its age. Returns True if anything was cached."""
+    found = False
+    for name, section in SECTIONS.items():
+        entry = cache.get(name)
+        if not entry:
+            continue
+        found = True
+        out.section(f"{section['title']} (cached {format_age(entry['saved'])} ago)", entry['records'],
+                    lambda record: format_record(out, record))
+    return found
+
+def diff_records(old, new, key):
+    """
+    Compare two lists of records.
+
+    Args:
+        old: Cached records
+        new: Refreshed records
+        key: Fields identifying a record
+
+    Returns:
+        List of change records: {'change': '+', '-' or '~', **record}, where
+        '~' records also carry 'was' with the fields that changed
+    """
+    def ident(record):
+        return tuple(record.get(field) for field in key)
+
+    before = {ident(record): record for record in old}
+    after = {ident(record): record for record in new}
+    changes = []
+    for record in new:
+        previous = before.get(ident(record))
+        if previous is None:
+            changes.append({'change': '+', **record})
+        elif previous != record:
+            was = {field: previous.get(field) for field in record if previous.get(field) != record[field]}
+            changes.append({'change': '~', **record, 'was': was})
+    for record in old:
+        if ident(record) not in after:
+            changes.append({'change': '-', **record})
+    return changes
+
+def format_change(out, change):
+    record = {field: value for field, value in change.items() if field not in ('change', 'was')}
+    line = f"{change['change']} {format_record(out, record)}"
+    if change.get('was'):
+        line += '    (was ' + ', '.join(f"{field} {value}" for field, value in change['was'].items()) + ')'
+    return line
+
+# The pipeline modules pull in pandas, bs4 and requests, which take far longer
+# to import than printing the cache does, so they're imported only to refresh.
+def refresh_zacks():
+    from client import query
+    from zacks import ZACKS_URL, fetch_page_content, extract_zacks_tickers, extract_top_movers
+
+    served = query('/zacks')
+    if served:
+        additions, movers = served['additions'], served['top_movers']
+    else:
+        html_content = fetch_page_content(ZACKS_URL)
+        if not html_content:
+            return {}
+        additions, movers = extract_zacks_tickers(html_content), extract_top_movers(html_content)
+    sections = {
+        'zacks_additions': [{'ticker': ticker} for ticker in sorted(additions)],
+        'zacks_top_movers': [{'ticker': ticker} for ticker in sorted(movers)],
+    }
+    # Same as refresh_congress: an empty list keeps the cached picks
+    return {name: records for name, records in sections.items() if records}
+
+def refresh_insider():
+    from client import query
+    from analyzer import CONFIG, analyze_ticker_data, summary_records
+    from rowfilter import RowFilter
+    from scrape import CONFIG as SCRAPE_CONFIG
+    from scraper import fetch_table, count_transactions
+
+    cfg = SCRAPE_CONFIG['insider']
+    filters = RowFilter(action='purchase', min_count=cfg['min_purchases'])
+    counts = query('/counts', source='insider')
+    if counts is None:
+        table = fetch_table(cfg['url'], cfg['selector'])
+        if not table:
+            return {}
+        counts = count_transactions(table, cfg['ticker_extractor'], cfg['sale_detector'](table), filters)
+    analysis = analyze_ticker_data([
+        {'ticker': ticker, 'purchases': purchases}
+        for ticker, (sales, purchases) in filters.select_counts(counts).items()
+    ])
+    return {'insider': summary_records(analysis, CONFIG['insider'])}
+
+def refresh_congress():
+    from analyzer import CONFIG, summary_records
+
+    records = summary_records(None, CONFIG['congress'])
+    # An empty list means the fetch failed as often as not; keep the cache then
+    return {'congress': records} if records else {}
+
+REFRESHERS = [refresh_zacks, refresh_insider, refresh_congress]
+
+def refresh_all():
+    """
+    Run every refresher concurrently.
+
+    Returns:
+        (dict of section name -> fresh records, list of sources that failed)
+    """
+    fresh, failed = {}, []
+    with ThreadPoolExecutor(max_workers=len(REFRESHERS)) as pool:
+        futures = {pool.submit(refresher): refresher.__name__[len('refresh_'):] for refresher in REFRESHERS}
+        for future, source in futures.items():
+            try:
+                sections = future.result()
+            except Exception as e:
+                print(f"Error refreshing {source}: {e}", file=sys.stderr)
+                sections = {}
+            if not sections:
+                failed.append(source)
+            fresh.update(sections)
+    return fresh, failed
+
+def main():
+    """Main function to print cached picks and then what changed"""
+    parser = argparse.ArgumentParser(description='Print cached picks instantly, then refresh and show changes')
+    parser.add_argument('--cached', action='store_true', help="Only print the cache; don't refresh")
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    cache = load_cache()
+    # The cached picks are a complete document of their own (json and csv
+    # Writers only emit on close), written before the refresh starts
+    with Writer(args.format) as out:
+        if not print_cached(out, cache):
+            out.message("No cached picks yet - fetching them now.")
+    if args.cached:
+        return
+    if not out.structured:
+        print("Refreshing...", file=sys.stderr)
+
+    with Writer(args.format) as out:
+        fresh, failed = refresh_all()
+        for source in failed:
+            out.message(f"Could not refresh {source}; keeping the cached picks.")
+
+        for name, section in SECTIONS.items():
+            if name not in fresh:
+                continue
+            if name not in cache:
+                out.section(section['title'], fresh[name], lambda record: format_record(out, record))
+                continue
+            changes = diff_records(cache[name]['records'], fresh[name], section['key'])
+            if changes:
+                out.section(f"{section['title']} - Changes", changes, lambda change: format_change(out, change))
+            elif not out.structured:
+                out.write(f"--- {section['title']} - No Changes ---\n")
+
+    if fresh:
+        cache_sections(fresh)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Cross-process token-bucket rate limiter.
+
+run.sh, the discord bot and ad-hoc scripts all hit the same hosts. Each host
+gets one bucket whose state lives in a small lock-protected file, so every
+process on the machine draws from the same budget instead of tripping the
+upstream limit on its own.
+
+Usage:
+    from ratelimit import acquire
+    acquire(url)  # blocks until a request to url's host is allowed
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Requests per second and burst size for each host
+LIMITS = {
+    'www.quiverquant.com': (1.0, 3),
+    'www.zacks.com': (1.0, 3),
+}
+DEFAULT_LIMIT = (2.0, 5)
+
+# STONKS_RATE / STONKS_BURST override every host's limit
+RATE_ENV = 'STONKS_RATE'
+BURST_ENV = 'STONKS_BURST'
+
+STATE_DIR = os.getenv('STONKS_STATE_DIR', os.path.join(tempfile.gettempdir(), 'stonks'))
+
+def get_limit(host):
+    """Return (rate, burst) for host, honoring environment overrides."""
+    rate, burst = LIMITS.get(host, DEFAULT_LIMIT)
+    try:
+        rate = float(os.getenv(RATE_ENV, rate))
+        burst = float(os.getenv(BURST_ENV, burst))
+    except ValueError:
+        pass
+    return max(rate, 1e-6), max(burst, 1.0)
+
+def _lock(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+def _unlock(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _take(path, rate, burst):
+    """
+    Try to take one token from the bucket stored at path.
+
+    Returns:
+        0 if a token was taken, otherwise seconds to wait before retrying
+    """
+    with open(path, 'a+') as f:
+        _lock(f)
+        try:
+            f.seek(0)
+            try:
+                state = json.loads(f.read() or '{}')
+            except ValueError:
+                state = {}
+            now = time.time()
+            tokens = state.get('tokens', burst)
+            elapsed = max(now - state.get('updated', now), 0)
+            tokens = min(burst, tokens + elapsed * rate)
+
+            wait = 0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps({'tokens': tokens, 'updated': now}))
+            f.flush()
+            return wait
+        finally:
+            _unlock(f)
+
+def acquire(url):
+    """
+    Block until a request to url's host fits in that host's shared budget.
+
+    If the state directory can't be used the limiter fails open, so a
+    read-only or missing temp dir never stops a fetch.
+    """
+    host = urlparse(url).hostname or 'default'
+    rate, burst = get_limit(host)
+    path = os.path.join(STATE_DIR, f"{host}.bucket")
+    try:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        while True:
+            wait = _take(path, rate, burst)
+            if not wait:
+                return
+            time.sleep(wait)
+    except OSError as e:
+        print(f"Warning: rate limiter unavailable ({e}), continuing without it", file=sys.stderr)
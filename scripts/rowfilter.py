@@ -0,0 +1,129 @@
+"""
+Filters pushed down into the row decoders.
+
+Instead of decoding every row of a table and filtering the results (or a
+DataFrame) afterwards, the decoders in scraper.py, analyzer.py,
+congress_df.py and stream.py take a RowFilter and check it while walking
+the rows, cheapest check first: the transaction type (one span or cell),
+then the trade date, then the ticker. A rejected row is dropped before the
+rest of its cells are read.
+
+min_count and limit apply to aggregated counts; limit keeps the best N with
+heapq.nlargest, which holds N items instead of sorting everything.
+
+Usage:
+    filters = RowFilter(action='purchase', since='2026-10-01', tickers=['NVDA'])
+    counts = count_transactions(table, ticker_extractor, sale_detector, filters, date_extractor)
+    counts = filters.select_counts(counts)
+"""
+import heapq
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+
+ACTIONS = ('purchase', 'sale')
+
+DATE_FORMATS = ['%Y-%m-%d', '%b %d, %Y', '%B %d, %Y', '%m/%d/%Y']
+
+@lru_cache(maxsize=4096)
+def _parse_date(text):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    # pandas writes datetimes as '2026-10-01 00:00:00'
+    if text[4:5] == '-' and text[7:8] == '-':
+        return text[:10]
+    # Anything else ('Sept 28, 2026', '28 Sep 2026', '2026/09/28') is read
+    # the way pd.to_datetime read it before the filters were pushed down
+    if not text:
+        return None
+    parsed = pd.to_datetime(text, errors='coerce')
+    return None if pd.isna(parsed) else parsed.strftime('%Y-%m-%d')
+
+def parse_date(text):
+    """Turn 'Oct 01, 2026', '2026-10-01 00:00:00' or any date pandas reads into '2026-10-01', or None."""
+    return _parse_date(str(text or '').strip())
+
+def normalize_date(text):
+    """Like parse_date, but hands back the original text when it isn't a date."""
+    return parse_date(text) or str(text or '').strip()
+
+class RowFilter:
+    """
+    Predicates for the row decoders.
+
+    Args:
+        action: 'purchase' or 'sale' to keep only that transaction type
+        since: Keep trades on or after this date (any format parse_date reads)
+        tickers: Keep only these tickers
+        min_count: Keep tickers with at least this many purchases (counts only)
+        limit: Keep only the top N (by purchases for counts)
+    """
+
+    def __init__(self, action=None, since=None, tickers=None, min_count=None, limit=None):
+        if action is not None and action not in ACTIONS:
+            raise ValueError(f"action must be one of {ACTIONS}, got {action!r}")
+        self.action = action
+        self.since = parse_date(since) if since else None
+        if since and self.since is None:
+            raise ValueError(f"Unrecognized date: {since!r}")
+        self.tickers = {t.strip().upper() for t in tickers if t.strip()} if tickers else None
+        self.min_count = min_count
+        self.limit = limit
+        # Rows a since filter dropped because their date couldn't be read
+        self.unreadable_dates = 0
+
+    def accepts_sale(self, is_sale):
+        """Check a row's sale flag (from a sale detector) against action."""
+        return self.action is None or bool(is_sale) == (self.action == 'sale')
+
+    def accepts_transaction(self, text):
+        """Check a transaction label like 'Purchase' or 'Sale (Partial)' against action."""
+        return self.action is None or self.action in (text or '').lower()
+
+    def accepts_date(self, text):
+        """Rows whose date can't be read never pass a since filter."""
+        if self.since is None:
+            return True
+        day = parse_date(text)
+        if day is None:
+            self.unreadable_dates += 1
+            return False
+        return day >= self.since
+
+    def accepts_ticker(self, ticker):
+        return self.tickers is None or (ticker or '').strip().upper() in self.tickers
+
+    def select_counts(self, counts):
+        """
+        Apply ticker, min_count and limit to counts from count_transactions.
+
+        Args:
+            counts: dict mapping ticker -> (sales_count, purchases_count)
+
+        Returns:
+            dict with only the tickers that pass
+        """
+        items = [
+            (ticker, counts[ticker]) for ticker in counts
+            if self.accepts_ticker(ticker)
+            and (self.min_count is None or counts[ticker][1] >= self.min_count)
+        ]
+        if self.limit is not None:
+            items = heapq.nlargest(self.limit, items, key=lambda item: item[1][1])
+        return dict(items)
+
+def filter_congress_rows(rows, filters):
+    """Yield the congress rows (extract_congress_data format) that pass filters."""
+    for row in rows:
+        if (filters.accepts_transaction(row.get('Transaction'))
+                and filters.accepts_date(row.get('Traded'))
+                and filters.accepts_ticker(row.get('Stock'))):
+            yield row
+
+def most_recent(rows, limit, field='Traded'):
+    """The limit rows with the latest dates in field, newest first, holding only limit rows at a time."""
+    return heapq.nlargest(limit, rows, key=lambda row: parse_date(row.get(field)) or '')
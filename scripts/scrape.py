@@ -1,58 +1,190 @@
 # Python script that can return recent insider or congress purchases 
 # USAGE: python scrape.py congress
 #        python scrape.py insider
+#        python scrape.py insider --rank value --export insider_transactions.csv
+#        python scrape.py congress --stream
+#        python scrape.py congress --since 2026-10-01 --ticker NVDA,MSFT --top 10
 # 
 import argparse
+import heapq
+import sys
+from output import Writer, add_format_argument
+from client import query
+from archive import add_replay_argument, apply_replay
+from memtrack import stage
 from scraper import (
     fetch_table, count_transactions,
-    congress_ticker_extractor, congress_sale_detector,
-    insider_ticker_extractor, insider_sale_detector
+    congress_ticker_extractor, make_congress_sale_detector, make_congress_date_extractor,
+    insider_ticker_extractor, make_insider_sale_detector, make_insider_date_extractor,
+    extract_insider_data, insider_dataframe, rank_insider_purchases
 )
+from stream import (
+    stream_table_rows, count_streamed_transactions,
+    congress_row_ticker, make_congress_row_is_sale, make_congress_row_traded,
+    insider_row_ticker, make_insider_row_is_sale, make_insider_row_traded
+)
+from rowfilter import RowFilter
+from quick import cache_sections
 
 CONFIG = {
     'congress': {
         'url': 'https://www.quiverquant.com/congresstrading/',
         'selector': 'table.table-congress.table-politician',
         'ticker_extractor': congress_ticker_extractor,
-        'sale_detector': congress_sale_detector,
+        'sale_detector': make_congress_sale_detector,
+        'date_extractor': make_congress_date_extractor,
+        'row_ticker': congress_row_ticker,
+        'row_sale': make_congress_row_is_sale,
+        'row_date': make_congress_row_traded,
+        'min_purchases': 3,
     },
     'insider': {
         'url': 'https://www.quiverquant.com/insiders/', 
         'selector': 'table.insider-trading-table',
         'ticker_extractor': insider_ticker_extractor,
-        'sale_detector': insider_sale_detector,
+        'sale_detector': make_insider_sale_detector,
+        'date_extractor': make_insider_date_extractor,
+        'row_ticker': insider_row_ticker,
+        'row_sale': make_insider_row_is_sale,
+        'row_date': make_insider_row_traded,
+        'min_purchases': 1,
     },
 }
 
+def print_purchases(out, source, counts):
+    """Print purchase counts per ticker (already narrowed by RowFilter.select_counts), returning the records"""
+    # Purchases, sorted by ticker
+    records = []
+    for ticker in sorted(counts):
+        sales, purchases = counts[ticker]
+        records.append({'ticker': ticker, 'purchases': purchases})
+    
+    # Add a header to indicate the source of the purchases.
+    out.section(f"{source.capitalize()} Purchases", records,
+                lambda record: f"{record['ticker']} {record['purchases']}")
+    return records
+
+def print_insider_rankings(out, table, rank, export=None, filters=None):
+    """Rank insider purchases using every column of the already fetched table"""
+    with stage('extract'):
+        df = insider_dataframe(extract_insider_data(table, filters))
+    if export:
+        with stage('export'):
+            df.to_csv(export, index=False)
+
+    with stage('analyze'):
+        ranked = rank_insider_purchases(df, by=rank)
+        del df
+        if filters and filters.min_count is not None:
+            ranked = ranked[ranked['purchases'] >= filters.min_count]
+        if filters and filters.limit is not None:
+            ranked = ranked.head(filters.limit)
+    records = [
+        {
+            'ticker': ticker,
+            'purchases': int(row['purchases']),
+            'insiders': int(row['insiders']),
+            'shares': int(row['shares']),
+            'value': float(row['value']),
+        }
+        for ticker, row in ranked.iterrows()
+    ]
+    # Only purchase counts keep the 'TICKER N' shape analyzer.py reads;
+    # the other ranks are labeled so they can't be mistaken for counts
+    labels = {
+        'purchases': lambda record: f"{record['ticker']} {record['purchases']}",
+        'value': lambda record: f"{record['ticker']} ${record['value']:,.0f}",
+        'insiders': lambda record: f"{record['ticker']} {record['insiders']} insider{'s' if record['insiders'] != 1 else ''}",
+    }
+    out.section(f"Insider Purchases by {rank.capitalize()}", records, labels[rank])
+
 def main():
     p = argparse.ArgumentParser(description='Scrape and count trading transactions.')
     p.add_argument('source', choices=CONFIG.keys(), help='Which dataset to scrape')
+    p.add_argument('--rank', choices=['purchases', 'value', 'insiders'], default='purchases',
+                   help='insider only: rank by purchase count, total dollar value or distinct insiders')
+    p.add_argument('--export', metavar='CSV',
+                   help='insider only: save every transaction with all its columns to CSV')
+    p.add_argument('--stream', action='store_true',
+                   help='Count rows while the page downloads and stop reading once the table ends')
+    p.add_argument('--since', metavar='DATE',
+                   help='Only count trades on or after this date, e.g. 2026-10-01')
+    p.add_argument('--ticker', '-t', action='append', default=[], metavar='TICKER',
+                   help='Only count these tickers (repeat or comma-separate)')
+    p.add_argument('--min-purchases', '-m', type=int, metavar='N',
+                   help='Only show tickers with at least N purchases (default: 3 congress, 1 insider)')
+    p.add_argument('--top', '-n', type=int, metavar='N', help='Only show the N tickers with the most purchases')
+    add_format_argument(p)
+    add_replay_argument(p)
     args = p.parse_args()
+    apply_replay(args)
     
     cfg = CONFIG[args.source]
-    table = fetch_table(cfg['url'], cfg['selector'])
-    if not table:
-        print(f"Error: Could not find table for {args.source}")
-        return
+    detailed = args.source == 'insider' and (args.rank != 'purchases' or args.export)
+    tickers = [t for arg in args.ticker for t in arg.split(',')]
+    min_count = args.min_purchases
+    if min_count is None and not detailed:
+        min_count = cfg['min_purchases']
+    try:
+        # Only purchases are shown, so sales are rejected while decoding rather than counted.
+        # --export keeps every transaction, so the action filter is left off there.
+        filters = RowFilter(
+            action=None if args.export else 'purchase',
+            since=args.since,
+            tickers=tickers,
+            min_count=min_count,
+            limit=args.top
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
     
-    counts = count_transactions(
-        table, 
-        cfg['ticker_extractor'], 
-        cfg['sale_detector']
-    )
+    # Plain counts can come straight from the query service if one is running;
+    # its counts have no dates, so --since always scrapes
+    counts = None if detailed or filters.since else query('/counts', source=args.source)
     
-    # Add a header to indicate the source of the purchases.
-    print(f"--- {args.source.capitalize()} Purchases ---")
+    if counts is None and args.stream and not detailed:
+        # Fetch, parse and extract are interleaved when streaming
+        with stage('stream'):
+            header = []
+            counts = count_streamed_transactions(
+                stream_table_rows(cfg['url'], cfg['selector'], header=header),
+                cfg['row_ticker'],
+                cfg['row_sale'](header),
+                filters,
+                cfg['row_date'](header)
+            )
     
-    # Set purchase threshold based on source
-    purchase_threshold = 2 if args.source == 'congress' else 0
+    table = None
+    if counts is None:
+        table = fetch_table(cfg['url'], cfg['selector'])
+        if not table:
+            print(f"Error: Could not find table for {args.source}", file=sys.stderr)
+            return
+
+    with Writer(args.format) as out:
+        if detailed:
+            print_insider_rankings(out, table, args.rank, args.export, filters)
+        else:
+            if counts is None:
+                with stage('extract'):
+                    counts = count_transactions(
+                        table, 
+                        cfg['ticker_extractor'], 
+                        cfg['sale_detector'](table),
+                        filters,
+                        cfg['date_extractor'](table)
+                    )
+                del table
+            records = print_purchases(out, args.source, filters.select_counts(counts))
+            if args.source == 'insider' and not (args.since or tickers or args.top) and args.min_purchases is None:
+                # The same top 5 analyzer.py shows, cached here because only this
+                # script knows the counts came from a live fetch
+                cache_sections({'insider': heapq.nlargest(5, records, key=lambda record: record['purchases'])})
     
-    # Print purchases, sorted by ticker
-    for ticker in sorted(counts):
-        sales, purchases = counts[ticker]
-        if purchases > purchase_threshold:
-            print(f"{ticker} {purchases}")
-            #print(f"{ticker} {sales} {purchases}")
+    if filters.unreadable_dates:
+        print(f"Warning: --since skipped {filters.unreadable_dates} rows whose trade date couldn't be read",
+              file=sys.stderr)
 
 if __name__ == '__main__':
     main()
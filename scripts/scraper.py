@@ -1,12 +1,30 @@
-import requests
 from bs4 import BeautifulSoup
 from collections import defaultdict
+import pandas as pd
+from archive import fetch_html
+from memtrack import stage
 
 def fetch_table(url, selector):
-    resp = requests.get(url)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, 'html.parser')
-    return soup.select_one(selector)
+    with stage('fetch'):
+        html = fetch_html(url, selector=selector)
+    with stage('parse'):
+        soup = BeautifulSoup(html, 'html.parser')
+        del html
+        return select_table(soup, selector)
+
+def select_table(soup, selector):
+    """
+    Select one element and free the rest of the parse tree.
+    
+    The element is detached first, so decomposing the soup releases
+    everything else on the page instead of keeping it alive through
+    the element's parent links.
+    """
+    element = soup.select_one(selector)
+    if element is not None:
+        element.extract()
+    soup.decompose()
+    return element
 
 def parse_rows(table, columns_map):
     data = []
@@ -21,7 +39,7 @@ def parse_rows(table, columns_map):
         data.append(item)
     return data
 
-def count_transactions(table, ticker_extractor, sale_detector):
+def count_transactions(table, ticker_extractor, sale_detector, filters=None, date_extractor=None):
     """
     Count sales and purchases by ticker.
     
@@ -29,6 +47,12 @@ def count_transactions(table, ticker_extractor, sale_detector):
         table: BeautifulSoup table element
         ticker_extractor: Function to extract ticker from a row
         sale_detector: Function to determine if a row is a sale
+        filters: Optional RowFilter; rows it rejects are skipped before
+                 their ticker is extracted (min_count/limit are not applied
+                 here, see RowFilter.select_counts)
+        date_extractor: Function to extract the trade date from a row
+                        (see make_insider_date_extractor), needed when
+                        filters has a since date
         
     Returns:
         dict mapping ticker -> (sales_count, purchases_count)
@@ -40,11 +64,20 @@ def count_transactions(table, ticker_extractor, sale_detector):
         return {}
         
     for row in tbody.find_all('tr'):
+        is_sale = sale_detector(row)
+        if filters:
+            if not filters.accepts_sale(is_sale):
+                continue
+            if filters.since and not filters.accepts_date(date_extractor(row)):
+                continue
+        
         ticker = ticker_extractor(row)
         if not ticker:
             continue
+        if filters and not filters.accepts_ticker(ticker):
+            continue
             
-        if sale_detector(row):
+        if is_sale:
             counts[ticker][0] += 1
         else:
             counts[ticker][1] += 1
@@ -73,12 +106,194 @@ def congress_sale_detector(row):
     tds = row.find_all('td', recursive=False)
     return len(tds) > 1 and tds[1].find('span', class_='sale') is not None
 
+def make_congress_sale_detector(table):
+    """Build a sale detector for congress rows (the span class, whatever the header)"""
+    return congress_sale_detector
+
+def make_cell_text_extractor(idx):
+    """Build a function returning the text of a row's idx-th cell"""
+    def extract(row):
+        tds = row.find_all('td', recursive=False)
+        return tds[idx].get_text(strip=True) if len(tds) > idx else None
+    return extract
+
+def make_congress_date_extractor(table):
+    """Build a trade date extractor for congress rows (always the fifth cell)"""
+    return make_cell_text_extractor(4)
+
 def insider_ticker_extractor(row):
     """Extract ticker from insider trading row"""
     ticker_elem = row.select_one('td a')
     return ticker_elem.text.strip() if ticker_elem else None
 
-def insider_sale_detector(row):
-    """Detect if insider row is a sale"""
-    action_elem = row.select_one('td:nth-of-type(3)')
-    return action_elem and action_elem.text.strip().lower() == 'sale'
+def is_insider_sale(action):
+    """
+    Decide if an insider action like 'Sale', 'Sale (Partial)' or 'Purchase' is a sale.
+
+    Every insider path (count_transactions, extract_insider_data,
+    rank_insider_purchases and the streamed rows) uses this one rule.
+    """
+    return 'sale' in (action or '').lower()
+
+def make_insider_sale_detector(table):
+    """Build a sale detector for insider rows, with the action column found from the table header"""
+    action = make_cell_text_extractor(insider_columns(table).get('action', INSIDER_COLUMNS['action']))
+
+    def detect(row):
+        return is_insider_sale(action(row))
+    return detect
+
+def make_insider_date_extractor(table):
+    """Build a trade date extractor for insider rows, with the column found from the table header"""
+    return make_cell_text_extractor(insider_columns(table).get('traded', INSIDER_COLUMNS['traded']))
+
+# Insider table columns, matched against the header text. Order matters:
+# 'filed' must win over the generic 'date' before the trade date is matched.
+INSIDER_HEADERS = [
+    ('ticker', ('stock', 'ticker', 'symbol')),
+    ('title', ('title', 'position', 'relationship')),
+    ('insider', ('insider', 'name', 'owner')),
+    ('action', ('transaction', 'action', 'type')),
+    ('shares', ('shares', 'qty', 'quantity')),
+    ('price', ('price',)),
+    ('value', ('value', 'amount', 'total')),
+    ('filed', ('filed', 'filing')),
+    ('traded', ('trade', 'date')),
+]
+
+# Column positions used when the table has no usable header
+INSIDER_COLUMNS = {
+    'ticker': 0, 'insider': 1, 'action': 2, 'shares': 3,
+    'price': 4, 'value': 5, 'traded': 6, 'filed': 7,
+}
+
+INSIDER_FIELDS = ['ticker', 'insider', 'title', 'action', 'shares', 'price', 'value', 'traded', 'filed']
+
+def insider_columns(table):
+    """Map insider fields to cell positions from the table header"""
+    return insider_columns_from_headers([th.get_text(' ', strip=True) for th in table.select('thead th')])
+
+def insider_columns_from_headers(headers):
+    """Map insider fields to cell positions from a list of header texts"""
+    headers = [text.lower() for text in headers]
+    columns = {}
+    for idx, text in enumerate(headers):
+        for field, keywords in INSIDER_HEADERS:
+            if field not in columns and any(k in text for k in keywords):
+                columns[field] = idx
+                break
+    if 'ticker' not in columns or 'action' not in columns:
+        return dict(INSIDER_COLUMNS)
+    return columns
+
+def parse_number(text):
+    """Parse '$1,234.50', '(500)', '+1.2K' or '3M' into a float, or None"""
+    if not text:
+        return None
+    clean = text.strip().replace('$', '').replace(',', '').replace('+', '')
+    negative = clean.startswith('(') and clean.endswith(')')
+    clean = clean.strip('()')
+    scale = 1
+    if clean[-1:].upper() in ('K', 'M', 'B'):
+        scale = {'K': 1e3, 'M': 1e6, 'B': 1e9}[clean[-1].upper()]
+        clean = clean[:-1]
+    try:
+        number = float(clean) * scale
+    except ValueError:
+        return None
+    return -number if negative else number
+
+def extract_insider_data(table, filters=None):
+    """
+    Decode every insider row into typed columns in one pass.
+
+    Args:
+        table: BeautifulSoup table element
+        filters: Optional RowFilter; rows it rejects are skipped before the
+                 rest of their cells are decoded
+
+    Returns:
+        List of dicts with ticker, insider, title, action, shares, price,
+        value, traded and filed
+    """
+    data = []
+    tbody = table.find('tbody') if table else None
+    if not tbody:
+        return data
+
+    columns = insider_columns(table)
+    for row in tbody.find_all('tr'):
+        cells = row.find_all('td', recursive=False)
+
+        def cell(field):
+            idx = columns.get(field)
+            return cells[idx] if idx is not None and idx < len(cells) else None
+
+        def text(field):
+            c = cell(field)
+            return c.get_text(strip=True) if c else None
+
+        if filters:
+            if not filters.accepts_sale(is_insider_sale(text('action'))):
+                continue
+            if filters.since and not filters.accepts_date(text('traded')):
+                continue
+
+        ticker_cell = cell('ticker')
+        link = ticker_cell.find('a') if ticker_cell else None
+        ticker = (link or ticker_cell).get_text(strip=True) if ticker_cell else None
+        if not ticker or ticker == '-':
+            continue
+        if filters and not filters.accepts_ticker(ticker):
+            continue
+
+        # The name cell usually holds the name first and the title after it
+        names = list(cell('insider').stripped_strings) if cell('insider') else []
+        insider = names[0] if names else None
+        title = cell('title').get_text(' ', strip=True) if cell('title') else ' '.join(names[1:]) or None
+
+        shares = parse_number(text('shares'))
+        data.append({
+            'ticker': ticker,
+            'insider': insider,
+            'title': title,
+            'action': text('action'),
+            'shares': int(shares) if shares is not None else None,
+            'price': parse_number(text('price')),
+            'value': parse_number(text('value')),
+            'traded': text('traded'),
+            'filed': text('filed'),
+        })
+    return data
+
+def insider_dataframe(data):
+    """Build a typed DataFrame from extract_insider_data rows"""
+    df = pd.DataFrame(data, columns=INSIDER_FIELDS)
+    df['shares'] = pd.to_numeric(df['shares'], errors='coerce').astype('Int64')
+    for col in ('price', 'value'):
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Fill in value from shares * price where the site leaves it blank
+    df['value'] = df['value'].fillna(df['shares'].astype('float64') * df['price'])
+    for col in ('traded', 'filed'):
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+def rank_insider_purchases(df, by='value'):
+    """
+    Rank tickers by insider purchases.
+
+    Args:
+        df: DataFrame from insider_dataframe
+        by: 'value' (total dollars), 'insiders' (distinct buyers) or 'purchases'
+
+    Returns:
+        DataFrame indexed by ticker with purchases, insiders, shares and value
+    """
+    buys = df[~df['action'].map(is_insider_sale)]
+    ranked = buys.groupby('ticker').agg(
+        purchases=('ticker', 'size'),
+        insiders=('insider', 'nunique'),
+        shares=('shares', 'sum'),
+        value=('value', 'sum'),
+    )
+    return ranked.sort_values([by, 'purchases'], ascending=False)
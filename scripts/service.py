@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Local Query Service
+This script keeps the latest Zacks, congress and insider results in memory and
+answers JSON queries over HTTP on localhost, so the CLIs, the discord bot and
+dashboards stop re-scraping QuiverQuant and Zacks on every call
+
+USAGE: python service.py [--port 8765] [--interval 900]
+       export STONKS_SERVICE=http://127.0.0.1:8765   # scripts become thin clients
+
+Endpoints (all GET, all JSON):
+    /health                      when the data was last refreshed
+    /top?source=SOURCE&n=5       top picks for zacks, congress or insider
+    /ticker/NVDA                 everything every source says about one ticker
+    /politician?name=pelosi      congress trades by politician from the portfolio index
+    /congress                    raw congress rows (extract_congress_data)
+    /counts?source=SOURCE        (sales, purchases) per ticker (count_transactions)
+    /zacks                       Zacks #1 Rank additions and top movers
+    /refresh                     re-run the pipeline now
+"""
+import argparse
+import heapq
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+from analyzer import fetch_table, extract_congress_data, analyze_ticker_data, get_recent_congress_records
+from congress_df import get_congress_dataframe, update_portfolio_index
+from portfolio import lookup_politician
+from scraper import (
+    count_transactions,
+    congress_ticker_extractor, congress_sale_detector,
+    insider_ticker_extractor, make_insider_sale_detector
+)
+from zacks import ZACKS_URL, fetch_page_content, extract_zacks_tickers, extract_top_movers
+
+CONGRESS_URL = 'https://www.quiverquant.com/congresstrading/'
+CONGRESS_SELECTOR = 'table.table-congress.table-politician'
+INSIDER_URL = 'https://www.quiverquant.com/insiders/'
+INSIDER_SELECTOR = 'table.insider-trading-table'
+
+DEFAULT_PORT = 8765
+
+def build_snapshot():
+    """
+    Run the whole fetch/parse/analyze pipeline once.
+
+    Every page is fetched once; the parsed table feeds both the counts and
+    the detailed extractors. Lookups are indexed here so queries are dict hits.
+
+    Returns:
+        dict holding the results, DataFrames and lookup indexes
+    """
+    snapshot = {'updated': datetime.now().isoformat(timespec='seconds')}
+
+    # Zacks
+    html_content = fetch_page_content(ZACKS_URL)
+    zacks = {'additions': [], 'top_movers': []}
+    if html_content:
+        zacks['additions'] = sorted(extract_zacks_tickers(html_content))
+        zacks['top_movers'] = sorted(extract_top_movers(html_content))
+    del html_content
+    snapshot['zacks'] = zacks
+
+    # Congress
+    table = fetch_table(CONGRESS_URL, CONGRESS_SELECTOR)
+    congress_rows = extract_congress_data(table)
+    congress_counts = count_transactions(table, congress_ticker_extractor, congress_sale_detector) if table else {}
+    del table
+    snapshot['congress_rows'] = congress_rows
+    snapshot['congress_counts'] = congress_counts
+    snapshot['congress_df'] = get_congress_dataframe(data=congress_rows)
+    snapshot['congress'] = analyze_ticker_data([
+        {'ticker': ticker, 'purchases': purchases}
+        for ticker, (sales, purchases) in congress_counts.items()
+    ])
+
+    # Insider
+    table = fetch_table(INSIDER_URL, INSIDER_SELECTOR)
+    insider_counts = count_transactions(table, insider_ticker_extractor, make_insider_sale_detector(table)) if table else {}
+    del table
+    snapshot['insider_counts'] = insider_counts
+    snapshot['insider'] = analyze_ticker_data([
+        {'ticker': ticker, 'purchases': purchases}
+        for ticker, (sales, purchases) in insider_counts.items()
+        if purchases > 0
+    ])
+
+    snapshot['top'] = {
+        'zacks': [{'ticker': t, 'list': 'additions'} for t in zacks['additions']] +
+                 [{'ticker': t, 'list': 'top_movers'} for t in zacks['top_movers']],
+        # congress and insider are ranked per request with heapq.nlargest,
+        # so any n works without sorting everything here; see answer()
+        'congress': congress_rows,
+        'insider': [
+            {'ticker': ticker, 'purchases': purchases}
+            for ticker, (sales, purchases) in insider_counts.items()
+            if purchases > 0
+        ],
+    }
+    snapshot['tickers'] = build_ticker_index(snapshot)
+    snapshot['portfolio'] = update_portfolio_index(congress_rows)
+    return snapshot
+
+def build_ticker_index(snapshot):
+    """Map ticker -> what each source says about it"""
+    index = {}
+
+    def entry(ticker):
+        return index.setdefault(ticker.strip().upper(), {'zacks': [], 'congress': [], 'insider': None})
+
+    for name in ('additions', 'top_movers'):
+        for ticker in snapshot['zacks'][name]:
+            entry(ticker)['zacks'].append(name)
+    for row in snapshot['congress_rows']:
+        entry(row['Stock'])['congress'].append(row)
+    for ticker, (sales, purchases) in snapshot['insider_counts'].items():
+        entry(ticker)['insider'] = {'sales': sales, 'purchases': purchases}
+    return index
+
+
+class Service:
+    """Holds the latest snapshot and refreshes it in the background."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.snapshot = None
+        self.refreshing = threading.Lock()
+
+    def refresh(self):
+        # A single refresh at a time; the old snapshot keeps serving meanwhile
+        if not self.refreshing.acquire(blocking=False):
+            return False
+        try:
+            started = time.time()
+            snapshot = build_snapshot()
+            self.snapshot = snapshot
+            print(f"Refreshed in {time.time() - started:.1f}s", file=sys.stderr)
+            return True
+        except Exception as e:
+            print(f"Error refreshing: {e}", file=sys.stderr)
+            return False
+        finally:
+            self.refreshing.release()
+
+    def run_forever(self):
+        while True:
+            self.refresh()
+            time.sleep(self.interval)
+
+    def answer(self, path, params):
+        """
+        Answer one query from the current snapshot.
+
+        Returns:
+            (status, JSON-serializable body)
+        """
+        if path == '/refresh':
+            threading.Thread(target=self.refresh, daemon=True).start()
+            return 202, {'refreshing': True}
+
+        snapshot = self.snapshot
+        if snapshot is None:
+            return 503, {'error': 'no data yet, first refresh still running'}
+
+        if path == '/health':
+            return 200, {'updated': snapshot['updated']}
+        if path == '/top':
+            source = params.get('source', 'insider')
+            if source not in snapshot['top']:
+                return 400, {'error': f"unknown source {source!r}"}
+            n = int(params.get('n', 5))
+            if n < 1:
+                return 400, {'error': f"n must be at least 1, got {n}"}
+            if source == 'insider':
+                return 200, heapq.nlargest(n, snapshot['top'][source], key=lambda record: record['purchases'])
+            if source == 'congress':
+                return 200, get_recent_congress_records(snapshot['top'][source], limit=n)
+            return 200, snapshot['top'][source][:n]
+        if path.startswith('/ticker/'):
+            ticker = path[len('/ticker/'):].strip().upper()
+            hit = snapshot['tickers'].get(ticker)
+            if hit is None:
+                return 404, {'error': f"{ticker} not found"}
+            return 200, {'ticker': ticker, **hit}
+        if path == '/politician':
+            return 200, lookup_politician(snapshot['portfolio'], params.get('name', ''))
+        if path == '/congress':
+            return 200, snapshot['congress_rows']
+        if path == '/counts':
+            source = params.get('source', 'insider')
+            counts = snapshot.get(f"{source}_counts")
+            if counts is None:
+                return 400, {'error': f"unknown source {source!r}"}
+            return 200, counts
+        if path == '/zacks':
+            return 200, snapshot['zacks']
+        return 404, {'error': f"unknown endpoint {path}"}
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                status, body = service.answer(unquote(url.path).rstrip('/') or '/', params)
+            except ValueError as e:
+                status, body = 400, {'error': str(e)}
+            data = json.dumps(body, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def main():
+    """Main function to run the service"""
+    parser = argparse.ArgumentParser(description='Serve the latest stonks analysis from memory')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', '-p', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--interval', '-i', type=int, default=900,
+                        help='Seconds between refreshes (default: 900)')
+    args = parser.parse_args()
+
+    service = Service(args.interval)
+    threading.Thread(target=service.run_forever, daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving on http://{args.host}:{args.port} (export STONKS_SERVICE=http://{args.host}:{args.port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Cross-Source Signal Join
+This script joins the Zacks #1 Rank lists, congress purchases and insider
+purchases on a normalized ticker and ranks every ticker by a combined
+conviction score (number of sources, purchase counts and recency)
+"""
+import argparse
+import math
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+from analyzer import fetch_table, extract_congress_data
+from scraper import count_transactions, insider_ticker_extractor, make_insider_sale_detector, make_insider_date_extractor
+from zacks import fetch_page_content, extract_zacks_tickers, extract_top_movers
+from history import PATTERNS, discover_csvs, snapshot_date
+from output import Writer, add_format_argument
+from portfolio import trade_key
+from rowfilter import normalize_date, parse_date
+
+SOURCES = ['zacks', 'congress', 'insider']
+
+# Purchases older than this many days count for half as much
+HALF_LIFE_DAYS = 7
+
+COLUMNS = ['ticker', 'purchases', 'date']
+
+def normalize_ticker(ticker):
+    """
+    Normalize a ticker so the same stock matches across sources.
+
+    Zacks, QuiverQuant and our CSVs disagree on case and on the class
+    separator (BRK.B vs BRK/B vs BRK-B), so everything becomes BRK-B.
+    """
+    if not isinstance(ticker, str):
+        return None
+    clean = ticker.strip().lstrip('$').upper().replace('.', '-').replace('/', '-')
+    return clean if clean and clean != '-' else None
+
+def make_frame(records):
+    """Build a (ticker, purchases, date) DataFrame with normalized tickers."""
+    df = pd.DataFrame(records, columns=COLUMNS)
+    df['ticker'] = df['ticker'].map(normalize_ticker)
+    df['purchases'] = pd.to_numeric(df['purchases'], errors='coerce').fillna(0).astype(int)
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    return df.dropna(subset=['ticker'])
+
+def fetch_zacks():
+    """Fetch today's Zacks #1 Rank additions and top movers."""
+    html_content = fetch_page_content("https://www.zacks.com/")
+    if not html_content:
+        return make_frame([])
+    today = datetime.now()
+    tickers = extract_zacks_tickers(html_content) + extract_top_movers(html_content)
+    return make_frame([(ticker, 1, today) for ticker in tickers])
+
+def congress_trade_key(row):
+    """Identify a congress trade the way portfolio.trade_key does, whichever snapshot it came from."""
+    return trade_key({
+        'politician': str(row.get('Politician') or '').strip(),
+        'ticker': normalize_ticker(row.get('Stock')),
+        'transaction': row.get('Transaction') or '',
+        'traded': normalize_date(row.get('Traded')),
+    })
+
+def congress_frame(rows):
+    """
+    Build the congress (ticker, purchases, date) frame, one record per distinct purchase.
+
+    The page lists a trade for days, so every snapshot (and the live fetch)
+    repeats it; counting each copy would inflate purchases and recency.
+    """
+    seen = set()
+    records = []
+    for row in rows:
+        if 'purchase' not in (row.get('Transaction') or '').lower():
+            continue
+        key = congress_trade_key(row)
+        if key in seen:
+            continue
+        seen.add(key)
+        records.append((row['Stock'], 1, row['Traded']))
+    return make_frame(records)
+
+def fetch_congress():
+    """Fetch recent congress trades as extract_congress_data rows."""
+    table = fetch_table('https://www.quiverquant.com/congresstrading/',
+                        'table.table-congress.table-politician')
+    return extract_congress_data(table)
+
+def fetch_insider():
+    """
+    Fetch recent insider purchase counts.
+
+    Returns:
+        tuple of (ticker, purchases, date) DataFrame and the earliest trade
+        date on the page as a Timestamp (None if no date could be read)
+    """
+    table = fetch_table('https://www.quiverquant.com/insiders/', 'table.insider-trading-table')
+    if not table:
+        return make_frame([]), None
+    counts = count_transactions(table, insider_ticker_extractor, make_insider_sale_detector(table))
+    traded = make_insider_date_extractor(table)
+    days = [parse_date(traded(row)) for row in table.select('tbody tr')]
+    covered = min((day for day in days if day), default=None)
+    today = datetime.now()
+    frame = make_frame([
+        (ticker, purchases, today)
+        for ticker, (sales, purchases) in counts.items()
+        if purchases > 0
+    ])
+    return frame, pd.Timestamp(covered) if covered else None
+
+def collapse_insider_history(df, covered=None):
+    """
+    Keep one purchase count per ticker per snapshot day.
+
+    Every snapshot holds the counts for the whole page, so the runs of one
+    day (and the days the page overlaps) repeat the same trades; summing
+    them would inflate purchases. The max of each day is kept, and days on
+    or after covered, which the live page already counts, are dropped.
+
+    Args:
+        df: insider (ticker, purchases, date) DataFrame from load_history
+        covered: Earliest trade date on the live page, or None
+    """
+    df = df.assign(date=df['date'].dt.normalize())
+    if covered is not None:
+        df = df[df['date'] < covered.normalize()]
+    return df.groupby(['ticker', 'date'], as_index=False)['purchases'].max()[COLUMNS]
+
+def load_history(data_dir):
+    """
+    Load every daily snapshot written by run.sh under data_dir.
+
+    Returns:
+        dict with the insider (ticker, purchases, date) DataFrame (every
+        snapshot as saved, see collapse_insider_history) and the congress rows
+        (extract_congress_data format, duplicates included; see congress_frame)
+    """
+    frames = {'insider': []}
+    congress_rows = []
+
+    for path in discover_csvs(data_dir, PATTERNS['insider']):
+        try:
+            df = pd.read_csv(path, usecols=['ticker', 'purchases'])
+        except Exception as e:
+            print(f"Warning: skipping {path} - {e}", file=sys.stderr)
+            continue
+        df['date'] = snapshot_date(path)
+        frames['insider'].append(df)
+
+    for path in discover_csvs(data_dir, 'congress_purchases_only*.csv'):
+        try:
+            df = pd.read_csv(path, usecols=['Stock', 'Transaction', 'Politician', 'Traded'], dtype=str)
+        except Exception as e:
+            print(f"Warning: skipping {path} - {e}", file=sys.stderr)
+            continue
+        congress_rows.extend(df.fillna('').to_dict('records'))
+
+    history = {'congress': congress_rows}
+    if frames['insider']:
+        history['insider'] = make_frame(pd.concat(frames['insider'], ignore_index=True))
+    return history
+
+def build_index(df):
+    """
+    Build a hash index over one source.
+
+    Trades are aggregated with a single groupby, so a long history costs one
+    pass over the rows and each later lookup is a dict access.
+
+    Returns:
+        dict mapping ticker -> (purchases, last_seen)
+    """
+    if df.empty:
+        return {}
+    grouped = df.groupby('ticker').agg(purchases=('purchases', 'sum'), last_seen=('date', 'max'))
+    return dict(zip(grouped.index, zip(grouped['purchases'], grouped['last_seen'])))
+
+def conviction_score(n_sources, weighted_purchases):
+    """Score a ticker: every extra source outweighs any amount of extra purchases."""
+    return n_sources + math.log1p(weighted_purchases) / (1 + math.log1p(weighted_purchases))
+
+def join_signals(indexes, now=None):
+    """
+    Join per-source indexes on ticker and score each ticker.
+
+    Args:
+        indexes: dict mapping source -> index from build_index
+        now: Reference time for recency weighting (defaults to now)
+
+    Returns:
+        pandas.DataFrame ranked by conviction, best first
+    """
+    now = now or datetime.now()
+    tickers = set()
+    for index in indexes.values():
+        tickers.update(index)
+
+    rows = []
+    for ticker in tickers:
+        sources = []
+        purchases = 0
+        weighted = 0.0
+        last_seen = None
+        for source in SOURCES:
+            hit = indexes.get(source, {}).get(ticker)
+            if hit is None:
+                continue
+            count, seen = hit
+            sources.append(source)
+            purchases += int(count)
+            if pd.notna(seen):
+                age_days = max((now - seen).total_seconds() / 86400, 0)
+                weighted += count * 0.5 ** (age_days / HALF_LIFE_DAYS)
+                last_seen = seen if last_seen is None else max(last_seen, seen)
+            else:
+                weighted += count
+        rows.append({
+            'ticker': ticker,
+            'sources': ','.join(sources),
+            'n_sources': len(sources),
+            'purchases': purchases,
+            'last_seen': last_seen.strftime('%Y-%m-%d') if last_seen is not None else '',
+            'score': round(conviction_score(len(sources), weighted), 3),
+        })
+
+    df = pd.DataFrame(rows, columns=['ticker', 'sources', 'n_sources', 'purchases', 'last_seen', 'score'])
+    return df.sort_values(['score', 'purchases', 'ticker'], ascending=[False, False, True])
+
+def print_signals(out, ranked, limit):
+    """Print the ranked list with clickable Yahoo Finance links."""
+    current_date = datetime.now().strftime("%m-%d-%Y")
+    records = [
+        {
+            'ticker': row['ticker'],
+            'sources': row['sources'],
+            'n_sources': int(row['n_sources']),
+            'purchases': int(row['purchases']),
+            'last_seen': row['last_seen'],
+            'score': float(row['score']),
+        }
+        for _, row in ranked.head(limit).iterrows()
+    ]
+    out.section(f"Combined Signals ({current_date})", records,
+                lambda r: f"{out.link(r['ticker'])}    {r['score']:.2f}    {r['sources']}    {r['purchases']}")
+
+def main():
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(description='Rank tickers flagged by Zacks, congress and insiders')
+    parser.add_argument('--history', '-H', metavar='DIR',
+                        help='Also join the daily snapshots run.sh saved under DIR (e.g. ../data)')
+    parser.add_argument('--min-sources', '-m', type=int, default=2,
+                        help='Only show tickers flagged by at least this many sources (default: 2)')
+    parser.add_argument('--top', '-n', type=int, default=20, help='Number of tickers to print')
+    parser.add_argument('--output', '-o', default='combined_signals_data.csv', help='Output CSV file path')
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    congress_rows = fetch_congress()
+    frames = {'zacks': fetch_zacks()}
+    frames['insider'], covered = fetch_insider()
+    if args.history:
+        history = load_history(args.history)
+        congress_rows = congress_rows + history['congress']
+        if 'insider' in history:
+            past = collapse_insider_history(history['insider'], covered)
+            frames['insider'] = pd.concat([frames['insider'], past], ignore_index=True)
+    # Snapshots overlap with each other and with the live page, so dedupe trades first
+    frames['congress'] = congress_frame(congress_rows)
+    del congress_rows
+
+    indexes = {source: build_index(df) for source, df in frames.items()}
+    ranked = join_signals(indexes)
+    ranked = ranked[ranked['n_sources'] >= args.min_sources]
+
+    with Writer(args.format) as out:
+        print_signals(out, ranked, args.top)
+
+    try:
+        ranked.to_csv(args.output, index=False)
+    except Exception as e:
+        print(f"Error exporting data: {e}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+"""
+Streaming fetch-and-parse for QuiverQuant tables.
+
+fetch_table downloads the whole page, then builds a BeautifulSoup tree of it.
+stream_table_rows instead feeds the response to an incremental HTML parser
+chunk by chunk as it downloads, yields each row of the target table as soon
+as it closes, and stops reading the moment the table ends, so the rest of the
+page is never downloaded or parsed.
+
+Rows are lists of cells; each cell is a dict with:
+    text   - the cell text, like get_text(strip=True)
+    spans  - list of (classes, text) for every <span> in the cell
+    links  - list of text for every <a> in the cell
+"""
+import codecs
+from collections import deque
+from html.parser import HTMLParser
+
+import requests
+
+from ratelimit import acquire
+from archive import load, store, replay_target, archiving_enabled
+from scraper import INSIDER_COLUMNS, insider_columns_from_headers, is_insider_sale
+
+CHUNK_SIZE = 16384
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+def parse_selector(selector):
+    """Split a simple 'tag.class1.class2' selector into (tag, set of classes)."""
+    tag, *classes = selector.strip().split('.')
+    return tag or 'table', set(classes)
+
+class TableRowParser(HTMLParser):
+    """Event-driven parser that collects the tbody rows of one table."""
+
+    def __init__(self, selector):
+        super().__init__(convert_charrefs=True)
+        self.tag, self.classes = parse_selector(selector)
+        self.rows = deque()
+        self.done = False
+        self.depth = 0          # table nesting depth inside the target table
+        self.in_tbody = False
+        self.in_thead = False
+        self.header = []        # header cell texts, once the thead is parsed
+        self.row = None
+        self.cell = None
+        self.spans = []         # open spans in the current cell
+        self.link = None        # open link in the current cell
+        self.pending = []       # text node so far; chunks can split it
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        self._end_text()
+        if self.depth == 0:
+            if tag == self.tag:
+                classes = set((dict(attrs).get('class') or '').split())
+                if self.classes <= classes:
+                    self.depth = 1
+            return
+
+        if tag == 'table':
+            self.depth += 1
+        elif self.depth > 1:
+            pass
+        elif tag == 'tbody':
+            self.in_tbody = True
+        elif tag == 'thead':
+            self.in_thead = True
+        elif tag == 'tr' and (self.in_tbody or self.in_thead):
+            self._end_row()
+            self.row = []
+        elif tag in ('td', 'th') and self.row is not None:
+            self._end_cell()
+            self.cell = {'text': [], 'spans': [], 'links': [], 'tag': tag}
+
+        if self.cell is not None:
+            if tag == 'span':
+                span = [(dict(attrs).get('class') or '').split(), []]
+                self.cell['spans'].append(span)
+                self.spans.append(span)
+            elif tag == 'a':
+                self.link = []
+                self.cell['links'].append(self.link)
+
+    def handle_endtag(self, tag):
+        if self.done or self.depth == 0:
+            return
+        self._end_text()
+        if tag == 'table':
+            self.depth -= 1
+            if self.depth == 0:
+                self._end_row()
+                self.done = True
+        elif self.depth > 1:
+            if tag == 'span' and self.spans:
+                self.spans.pop()
+            elif tag == 'a':
+                self.link = None
+        elif tag == 'tbody':
+            self._end_row()
+            self.in_tbody = False
+        elif tag == 'thead':
+            self._end_row()
+            self.in_thead = False
+        elif tag == 'tr':
+            self._end_row()
+        elif tag in ('td', 'th'):
+            self._end_cell()
+        elif tag == 'span' and self.spans:
+            self.spans.pop()
+        elif tag == 'a':
+            self.link = None
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.pending.append(data)
+
+    def _end_text(self):
+        if not self.pending:
+            return
+        text = ''.join(self.pending).strip()
+        self.pending = []
+        if not text or self.cell is None:
+            return
+        self.cell['text'].append(text)
+        for span in self.spans:
+            span[1].append(text)
+        if self.link is not None:
+            self.link.append(text)
+
+    def _end_cell(self):
+        if self.cell is None:
+            return
+        cell = self.cell
+        self.row.append({
+            'tag': cell['tag'],
+            'text': ''.join(cell['text']),
+            'spans': [(classes, ''.join(text)) for classes, text in cell['spans']],
+            'links': [''.join(text) for text in cell['links']],
+        })
+        self.cell = None
+        self.spans = []
+        self.link = None
+
+    def _end_row(self):
+        self._end_cell()
+        if self.row is not None:
+            if self.in_thead:
+                self.header = self.header or [cell['text'] for cell in self.row]
+            else:
+                self.rows.append([cell for cell in self.row if cell['tag'] == 'td'])
+        self.row = None
+
+def iter_html(url, headers=None, chunk_size=CHUNK_SIZE, selector=None):
+    """
+    Yield decoded chunks of url's body as they arrive.
+
+    When replaying, chunks come from the archived snapshot instead (one
+    holding the selector's whole table, see archive.find). Live reads are
+    archived when the generator finishes or is closed early.
+    """
+    when = replay_target()
+    if when:
+        text = load(url, when, selector)
+        for i in range(0, len(text), chunk_size):
+            yield text[i:i + chunk_size]
+        return
+
+    acquire(url)
+    resp = requests.get(url, headers=headers or HEADERS, stream=True, timeout=10)
+    received = []
+    complete = False
+    try:
+        resp.raise_for_status()
+        decoder = codecs.getincrementaldecoder(resp.encoding or 'utf-8')(errors='replace')
+        for chunk in resp.iter_content(chunk_size=chunk_size):
+            text = decoder.decode(chunk)
+            received.append(text)
+            yield text
+        received.append(decoder.decode(b'', final=True))
+        yield received[-1]
+        complete = True
+    finally:
+        resp.close()
+        if received and archiving_enabled():
+            store(url, ''.join(received), partial=not complete)
+
+def stream_table_rows(url, selector, headers=None, chunks=None, header=None):
+    """
+    Yield the tbody rows of the table matching selector while url downloads.
+
+    Args:
+        url: Page to fetch
+        selector: 'table.class1.class2' style selector of the target table
+        headers: Optional request headers
+        chunks: Iterable of text chunks to parse instead of fetching url
+        header: Optional list, filled with the table's header cell texts
+                before the first row is yielded
+
+    Yields:
+        Lists of cell dicts (see module docstring)
+    """
+    parser = TableRowParser(selector)
+    chunks = chunks if chunks is not None else iter_html(url, headers, selector=selector)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            if header is not None and parser.rows and not header:
+                header.extend(parser.header)
+            while parser.rows:
+                yield parser.rows.popleft()
+            if parser.done:
+                break
+        parser.close()
+        if header is not None and parser.rows and not header:
+            header.extend(parser.header)
+        while parser.rows:
+            yield parser.rows.popleft()
+    finally:
+        # Closing the generator closes the response, skipping the page's tail
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+# Row functions mirroring the BeautifulSoup extractors in scraper.py
+def congress_row_ticker(cells):
+    """Extract ticker from a streamed congress trading row"""
+    if not cells:
+        return None
+    spans = cells[0]['spans']
+    span = (next((s for s in spans if 'positive' in s[0]), None) or
+            next((s for s in spans if 'negative' in s[0]), None) or
+            (spans[0] if spans else None))
+    if not span:
+        return None
+    return span[1] if span[1] != '-' else None
+
+def congress_row_is_sale(cells):
+    """Detect if a streamed congress row is a sale"""
+    return len(cells) > 1 and any('sale' in classes for classes, _ in cells[1]['spans'])
+
+def make_congress_row_is_sale(header):
+    """Build a sale detector for streamed congress rows (the span class, whatever the header)"""
+    return congress_row_is_sale
+
+def make_row_text_extractor(idx):
+    """Build a function returning the text of a streamed row's idx-th cell"""
+    def extract(cells):
+        return cells[idx]['text'] if len(cells) > idx else None
+    return extract
+
+def make_congress_row_traded(header):
+    """Build a trade date extractor for streamed congress rows (always the fifth cell)"""
+    return make_row_text_extractor(4)
+
+def insider_row_ticker(cells):
+    """Extract ticker from a streamed insider trading row"""
+    for cell in cells:
+        if cell['links']:
+            return cell['links'][0].strip()
+    return None
+
+def make_insider_row_extractor(header, field):
+    """
+    Build a text extractor for one field of streamed insider rows.
+
+    header is the list stream_table_rows fills in; the column is looked up
+    from it on the first row, once the thead has been parsed.
+    """
+    column = []
+
+    def extract(cells):
+        if not column:
+            column.append(insider_columns_from_headers(header).get(field, INSIDER_COLUMNS[field]))
+        return cells[column[0]]['text'] if len(cells) > column[0] else None
+    return extract
+
+def make_insider_row_is_sale(header):
+    """Build a sale detector for streamed insider rows (see scraper.is_insider_sale)"""
+    action = make_insider_row_extractor(header, 'action')
+
+    def is_sale(cells):
+        return is_insider_sale(action(cells))
+    return is_sale
+
+def make_insider_row_traded(header):
+    """Build a trade date extractor for streamed insider rows"""
+    return make_insider_row_extractor(header, 'traded')
+
+def congress_row_data(cells, filters=None):
+    """Decode a streamed congress row like analyzer.extract_congress_data does"""
+    if len(cells) < 5:
+        return None
+    transaction = cells[1]['spans'][0][1] if cells[1]['spans'] else None
+    if filters and not (filters.accepts_transaction(transaction)
+                        and filters.accepts_date(cells[4]['text'])):
+        return None
+    ticker = congress_row_ticker(cells)
+    if not ticker:
+        return None
+    if filters and not filters.accepts_ticker(ticker):
+        return None
+    return {
+        'Stock': ticker,
+        'Transaction': transaction,
+        'Politician': cells[2]['text'],
+        'Filed': cells[3]['text'],
+        'Traded': cells[4]['text'],
+    }
+
+def count_streamed_transactions(rows, ticker_fn, sale_fn, filters=None, date_fn=None):
+    """
+    Count sales and purchases by ticker from streamed rows.
+
+    Args:
+        filters: Optional RowFilter, checked like scraper.count_transactions does
+        date_fn: Function to extract the trade date, needed for filters.since
+
+    Returns:
+        dict mapping ticker -> (sales_count, purchases_count)
+    """
+    counts = {}
+    for cells in rows:
+        is_sale = sale_fn(cells)
+        if filters:
+            if not filters.accepts_sale(is_sale):
+                continue
+            if filters.since and not filters.accepts_date(date_fn(cells)):
+                continue
+        ticker = ticker_fn(cells)
+        if not ticker:
+            continue
+        if filters and not filters.accepts_ticker(ticker):
+            continue
+        sales, purchases = counts.get(ticker, (0, 0))
+        if is_sale:
+            counts[ticker] = (sales + 1, purchases)
+        else:
+            counts[ticker] = (sales, purchases + 1)
+    return counts
+
+def stream_congress_data(url, selector, headers=None, filters=None):
+    """Streamed equivalent of extract_congress_data(fetch_table(url, selector), filters)"""
+    data = []
+    for cells in stream_table_rows(url, selector, headers):
+        entry = congress_row_data(cells, filters)
+        if entry:
+            data.append(entry)
+    return data
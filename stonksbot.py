@@ -11,6 +11,7 @@
 # 3. In Discord, you can run:
 #    /stonks - Full analysis with CSV files
 #    /quickstonks - Quick picks without files
+#    /portfolio - Congress trades by a politician or in a ticker
 #    /ping - Check bot latency
 
 import discord
@@ -18,6 +19,7 @@ from discord import app_commands
 from discord.ext import commands
 import subprocess
 import asyncio
+import json
 import os
 import sys
 import platform
@@ -114,11 +116,11 @@ async def quickstonks(ctx: discord.Interaction):
     await ctx.response.defer()
     
     try:
-        # Run a simplified version - just get the console output
+        # Run a simplified version - just get the structured output
         commands_to_run = [
-            "cd scripts && python zacks.py",
-            "cd scripts && python scrape.py congress | python analyzer.py congress",
-            "cd scripts && python scrape.py insider | python analyzer.py insider"
+            "cd scripts && python zacks.py --format json",
+            "cd scripts && python scrape.py congress | python analyzer.py congress --format json",
+            "cd scripts && python scrape.py insider | python analyzer.py insider --format json"
         ]
         
         embed = discord.Embed(
@@ -148,43 +150,24 @@ async def quickstonks(ctx: discord.Interaction):
             if error:
                 print(f"Error in command '{cmd}': {error}")
             
-            # Parse output for the section header and tickers
-            lines = output.strip().split('\n')
-            for i, line in enumerate(lines):
-                # Look for section headers - be more inclusive in matching
-                if '---' in line and any(keyword in line for keyword in ['Zacks', 'Recent', 'Congress', 'Insider']):
-                    title = line.replace('---', '').strip()
-                    # Get the next few lines as tickers
-                    tickers = []
-                    for j in range(i+1, min(i+6, len(lines))):
-                        if lines[j].strip() and not lines[j].startswith('---'):
-                            # Clean ANSI codes - fixed regex patterns
-                            import re
-                            ticker_line = lines[j]
-                            
-                            # First try to extract from OSC 8 hyperlinks (terminal clickable links)
-                            if '\033]8;;' in ticker_line:
-                                # Extract text between the OSC 8 markers
-                                match = re.search(r'\033\]8;;[^\033]*\033\\([^\033]+)\033\]8;;\033\\', ticker_line)
-                                if match:
-                                    ticker = match.group(1).strip()
-                                else:
-                                    # Fallback: just remove all ANSI codes
-                                    ticker = re.sub(r'\033\[[^m]*m|\033\][^\\]*\\', '', ticker_line).strip()
-                            else:
-                                # Remove any ANSI color codes
-                                ticker = re.sub(r'\033\[[^m]*m', '', ticker_line).strip()
-                            
-                            if ticker:
-                                # Create clickable link to Yahoo Finance
-                                tickers.append(f"[{ticker}](https://finance.yahoo.com/quote/{ticker})")
-                    
-                    if tickers:
-                        embed.add_field(
-                            name=title,
-                            value='\n'.join(tickers),
-                            inline=False
-                        )
+            # Each script prints a JSON list of {"title", "records"} sections
+            try:
+                sections = json.loads(output) if output.strip() else []
+            except ValueError:
+                print(f"Unexpected output from '{cmd}': {output[:200]}")
+                continue
+            
+            for section in sections:
+                tickers = [
+                    f"[{record['ticker']}](https://finance.yahoo.com/quote/{record['ticker']})"
+                    for record in section['records'][:5]
+                ]
+                if tickers:
+                    embed.add_field(
+                        name=section['title'],
+                        value='\n'.join(tickers),
+                        inline=False
+                    )
         
         if not embed.fields:
             embed.description = "No trading data found. The scripts may have encountered an issue."
@@ -197,4 +180,56 @@ async def quickstonks(ctx: discord.Interaction):
     except Exception as e:
         await ctx.followup.send(f"Error during quick analysis: {str(e)[:500]}")
 
+@bot.tree.command(name="portfolio", description="Show a politician's congress trades, or who traded a ticker")
+@app_commands.guilds(GUILD_ID)
+@app_commands.describe(politician="Politician name (partial names match)", ticker="Ticker symbol")
+async def portfolio(ctx: discord.Interaction, politician: str = None, ticker: str = None):
+    politician = (politician or '').strip() or None
+    ticker = (ticker or '').strip() or None
+    if not politician and not ticker:
+        await ctx.response.send_message("Give a politician, a ticker, or both.", ephemeral=True)
+        return
+    await ctx.response.defer()
+    
+    try:
+        # Arguments go straight to the script, never through a shell
+        args = ["--format", "json"]
+        if politician:
+            args += ["--politician", politician]
+        if ticker:
+            args += ["--ticker", ticker]
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "congress_df.py", *args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts")
+        )
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30.0)
+        if stderr:
+            print(f"Error in portfolio lookup: {stderr.decode('utf-8')}")
+        sections = json.loads(stdout.decode('utf-8')) if stdout.strip() else []
+        
+        embed = discord.Embed(
+            title="Congress Portfolio",
+            color=discord.Color.blue(),
+            timestamp=datetime.now()
+        )
+        for section in sections:
+            lines = [
+                f"[{record['ticker']}](https://finance.yahoo.com/quote/{record['ticker']}) "
+                f"{record['transaction']} - {record['politician']} {record['traded']}"
+                for record in section['records'][:15]
+            ]
+            embed.add_field(
+                name=section['title'],
+                value='\n'.join(lines)[:1024] if lines else "No trades found",
+                inline=False
+            )
+        await ctx.followup.send(embed=embed)
+        
+    except asyncio.TimeoutError:
+        await ctx.followup.send("Portfolio lookup timed out.")
+    except Exception as e:
+        await ctx.followup.send(f"Error during portfolio lookup: {str(e)[:500]}")
+
 bot.run(TOKEN)
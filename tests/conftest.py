@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# The scripts import each other as top-level modules, the way they're run
+sys.path.insert(0, SCRIPTS_DIR)
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return f.read()
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    """Keep tests off the network and out of data/: no replay, no archiving, no query service."""
+    monkeypatch.delenv('STONKS_REPLAY', raising=False)
+    monkeypatch.delenv('STONKS_SERVICE', raising=False)
+    monkeypatch.setenv('STONKS_ARCHIVE', '0')
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import pytest
+
+import archive
+from conftest import read_fixture
+
+URL = 'https://www.quiverquant.com/insiders/'
+SELECTOR = 'table.insider-trading-table'
+
+class FixedDatetime(datetime):
+    """datetime whose now() is set by the test, so store() records chosen fetch times."""
+    current = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+@pytest.fixture
+def snapshots(monkeypatch, tmp_path):
+    """Store pages in a throwaway archive as if fetched at given times."""
+    monkeypatch.setattr(archive, 'ARCHIVE_DIR', str(tmp_path))
+    monkeypatch.setattr(archive, 'datetime', FixedDatetime)
+    (tmp_path / 'index.ndjson').touch()
+
+    def add(fetched, text, partial=False):
+        FixedDatetime.current = FixedDatetime.fromisoformat(fetched)
+        archive.store(URL, text, partial=partial)
+    return add
+
+@pytest.fixture
+def pages():
+    page = read_fixture('insider.html')
+    end = page.index('</table>') + len('</table>')
+    return {
+        'complete': page,
+        # Streamed read that stopped once the table ended
+        'table': page[:end],
+        # Streamed read that was cut off before the table ended
+        'cut': page[:page.index('</tr>') + len('</tr>')],
+    }
+
+def test_parse_when():
+    assert archive.parse_when('latest') == 'latest'
+    assert archive.parse_when('2026-10-01T09:30') == datetime(2026, 10, 1, 9, 30)
+    assert archive.parse_when(' 2026-10-01 ') == datetime(2026, 10, 1, 23, 59, 59, 999999)
+    for bad in ('yesterday', '', '10/01/2026'):
+        with pytest.raises(ValueError):
+            archive.parse_when(bad)
+
+def test_has_table(pages):
+    assert archive.has_table(pages['complete'], SELECTOR)
+    assert archive.has_table(pages['table'], SELECTOR)
+    assert not archive.has_table(pages['cut'], SELECTOR)
+    assert not archive.has_table(pages['complete'], 'table.table-congress')
+
+def test_find_newest_at_or_before(snapshots, pages):
+    snapshots('2026-10-01T09:00:00', pages['complete'])
+    snapshots('2026-10-02T09:00:00', pages['complete'] + '<!-- 2 -->')
+    assert archive.find(URL)['fetched'] == '2026-10-02T09:00:00'
+    assert archive.find(URL, '2026-10-01')['fetched'] == '2026-10-01T09:00:00'
+    assert archive.find(URL, '2026-10-01T08:59') is None
+
+def test_find_prefers_complete_from_same_run(snapshots, pages):
+    snapshots('2026-10-02T09:00:00', pages['complete'])
+    snapshots('2026-10-02T09:05:00', pages['table'], partial=True)
+    assert archive.find(URL, selector=SELECTOR)['fetched'] == '2026-10-02T09:00:00'
+
+def test_find_keeps_newer_partial_over_old_complete(snapshots, pages):
+    snapshots('2026-09-20T09:00:00', pages['complete'])
+    snapshots('2026-10-02T09:00:00', pages['table'], partial=True)
+    assert archive.find(URL)['fetched'] == '2026-10-02T09:00:00'
+    assert archive.find(URL, selector=SELECTOR)['fetched'] == '2026-10-02T09:00:00'
+
+def test_find_skips_cut_off_partials(snapshots, pages):
+    snapshots('2026-09-20T09:00:00', pages['complete'])
+    snapshots('2026-10-01T09:00:00', pages['table'], partial=True)
+    snapshots('2026-10-02T09:00:00', pages['cut'], partial=True)
+    assert archive.find(URL, selector=SELECTOR)['fetched'] == '2026-10-01T09:00:00'
+    assert archive.load(URL, selector=SELECTOR) == pages['table']
+    # Without a selector nothing is known about the table, so the newest wins
+    assert archive.find(URL)['fetched'] == '2026-10-02T09:00:00'
+
+def test_load_misses(snapshots, pages):
+    snapshots('2026-10-02T09:00:00', pages['complete'])
+    with pytest.raises(archive.ArchiveMiss):
+        archive.load(URL, '2026-10-01')
+    with pytest.raises(archive.ArchiveMiss):
+        archive.load(URL, 'yesterday')
+    with pytest.raises(archive.ArchiveMiss):
+        archive.load('https://www.zacks.com/')
@@ -0,0 +1,61 @@
+from bs4 import BeautifulSoup
+import pandas as pd
+import pytest
+
+import portfolio
+from analyzer import extract_congress_data
+from conftest import read_fixture
+from scraper import select_table
+
+@pytest.fixture
+def rows():
+    table = select_table(BeautifulSoup(read_fixture('congress.html'), 'html.parser'),
+                         'table.table-congress.table-politician')
+    return extract_congress_data(table)
+
+def test_add_trades_dedupes_overlapping_scrapes(rows):
+    index = portfolio.new_index()
+    assert portfolio.add_trades(index, rows) == 5
+    # The same page scraped again, and again with dates written differently
+    assert portfolio.add_trades(index, rows) == 0
+    reformatted = [{**row, 'Traded': pd.to_datetime(row['Traded']).strftime('%Y-%m-%d %H:%M:%S')} for row in rows]
+    assert portfolio.add_trades(index, reformatted) == 0
+    assert len(index['trades']) == 5
+
+def test_add_trades_skips_rows_without_ticker_or_politician():
+    index = portfolio.new_index()
+    added = portfolio.add_trades(index, [
+        {'Stock': '-', 'Transaction': 'Purchase', 'Politician': 'Someone', 'Traded': 'Sep 20, 2026'},
+        {'Stock': 'NVDA', 'Transaction': 'Purchase', 'Politician': ' ', 'Traded': 'Sep 20, 2026'},
+    ])
+    assert added == 0
+
+def test_ingest_history_reads_each_file_once(rows, tmp_path):
+    day = tmp_path / '10-10-2026'
+    day.mkdir()
+    pd.DataFrame(rows).to_csv(day / 'congress_purchases_only_09-00-00.csv', index=False)
+
+    index = portfolio.new_index()
+    portfolio.add_trades(index, rows[:2])
+    assert portfolio.ingest_history(index, str(tmp_path)) == 3
+    assert index['files'] == ['10-10-2026/congress_purchases_only_09-00-00.csv']
+    assert portfolio.ingest_history(index, str(tmp_path)) == 0
+
+def test_lookups(rows, tmp_path):
+    index = portfolio.build_index(rows)
+    path = str(tmp_path / 'portfolio_index.json')
+    portfolio.save_index(index, path)
+    index = portfolio.load_index(path)
+
+    exact = portfolio.lookup_politician(index, 'ro khanna')
+    assert [(t['ticker'], t['traded']) for t in exact] == [('MSFT', '2026-10-03'), ('NVDA', '2026-10-02')]
+    assert portfolio.lookup_politician(index, ' KHANNA ') == exact
+    assert portfolio.lookup_politician(index, 'nobody') == []
+
+    nvda = portfolio.lookup_ticker(index, 'nvda')
+    assert [t['politician'] for t in nvda] == ['Ro Khanna', 'Nancy Pelosi', 'Tommy Tuberville']
+
+@pytest.mark.parametrize('name', ['', '   ', None])
+def test_lookup_politician_rejects_blank_names(rows, name):
+    with pytest.raises(ValueError):
+        portfolio.lookup_politician(portfolio.build_index(rows), name)
@@ -0,0 +1,58 @@
+import json
+from datetime import datetime
+
+import quick
+
+KEY = quick.SECTIONS['congress']['key']
+
+def test_diff_records():
+    old = [
+        {'ticker': 'NVDA', 'politician': 'Nancy Pelosi', 'traded': '2026-10-01', 'purchases': 1},
+        {'ticker': 'MSFT', 'politician': 'Ro Khanna', 'traded': '2026-10-03', 'purchases': 1},
+    ]
+    new = [
+        {'ticker': 'NVDA', 'politician': 'Nancy Pelosi', 'traded': '2026-10-01', 'purchases': 2},
+        {'ticker': 'KO', 'politician': 'Ro Khanna', 'traded': '2026-10-05', 'purchases': 1},
+    ]
+    changes = quick.diff_records(old, new, KEY)
+    assert changes == [
+        {'change': '~', **new[0], 'was': {'purchases': 1}},
+        {'change': '+', **new[1]},
+        {'change': '-', **old[1]},
+    ]
+    assert quick.diff_records(old, old, KEY) == []
+
+def test_diff_records_same_ticker_different_trade():
+    old = [{'ticker': 'NVDA', 'politician': 'Nancy Pelosi', 'traded': '2026-10-01'}]
+    new = [{'ticker': 'NVDA', 'politician': 'Ro Khanna', 'traded': '2026-10-01'}]
+    assert [change['change'] for change in quick.diff_records(old, new, KEY)] == ['+', '-']
+
+def test_format_age():
+    now = datetime(2026, 10, 19, 12, 0, 0)
+    assert quick.format_age('2026-10-19T11:59:15', now) == '45s'
+    assert quick.format_age('2026-10-19T11:48:00', now) == '12m'
+    assert quick.format_age('2026-10-19T09:00:00', now) == '3h'
+    assert quick.format_age('2026-10-17T12:00:00', now) == '2d'
+    assert quick.format_age('2026-10-19T12:00:05', now) == '0s'
+
+def test_cache_sections_keeps_other_sections(tmp_path):
+    path = str(tmp_path / 'quick_cache.json')
+    quick.cache_sections({'insider': [{'ticker': 'NVDA', 'purchases': 2}]}, path)
+    quick.cache_sections({'congress': [{'ticker': 'MSFT'}]}, path)
+    cache = quick.load_cache(path)
+    assert cache['insider']['records'] == [{'ticker': 'NVDA', 'purchases': 2}]
+    assert cache['congress']['records'] == [{'ticker': 'MSFT'}]
+
+def test_cache_sections_skips_replays(tmp_path, monkeypatch):
+    path = tmp_path / 'quick_cache.json'
+    monkeypatch.setenv(quick.REPLAY_ENV, 'latest')
+    quick.cache_sections({'insider': [{'ticker': 'NVDA'}]}, str(path))
+    assert not path.exists()
+
+def test_load_cache_survives_a_broken_file(tmp_path):
+    path = tmp_path / 'quick_cache.json'
+    assert quick.load_cache(str(path)) == {}
+    path.write_text('{not json')
+    assert quick.load_cache(str(path)) == {}
+    path.write_text(json.dumps({'insider': {'saved': '2026-10-19T09:00:00', 'records': []}}))
+    assert 'insider' in quick.load_cache(str(path))
@@ -0,0 +1,64 @@
+import pytest
+
+from rowfilter import RowFilter, parse_date, normalize_date, most_recent, filter_congress_rows
+
+@pytest.mark.parametrize('text, expected', [
+    ('Oct 01, 2026', '2026-10-01'),
+    ('October 1, 2026', '2026-10-01'),
+    ('10/01/2026', '2026-10-01'),
+    ('2026-10-01', '2026-10-01'),
+    ('2026-10-01 00:00:00', '2026-10-01'),
+    # Formats only pandas reads
+    ('Sept 28, 2026', '2026-09-28'),
+    ('28 Sep 2026', '2026-09-28'),
+    ('2026/09/28', '2026-09-28'),
+    ('  Oct 01, 2026 ', '2026-10-01'),
+    ('', None),
+    (None, None),
+    ('soon', None),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text) == expected
+
+def test_normalize_date_keeps_text_that_is_not_a_date():
+    assert normalize_date('Oct 01, 2026') == '2026-10-01'
+    assert normalize_date(' soon ') == 'soon'
+
+def test_since_counts_unreadable_dates():
+    filters = RowFilter(since='Oct 01, 2026')
+    assert filters.accepts_date('2026-10-02')
+    assert filters.accepts_date('Oct 01, 2026')
+    assert not filters.accepts_date('Sep 30, 2026')
+    assert not filters.accepts_date('soon')
+    assert filters.unreadable_dates == 1
+
+def test_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        RowFilter(action='buy')
+    with pytest.raises(ValueError):
+        RowFilter(since='soon')
+
+def test_select_counts():
+    counts = {'NVDA': (0, 5), 'KO': (1, 1), 'TSLA': (3, 0), 'MSFT': (0, 2)}
+    assert RowFilter(min_count=2).select_counts(counts) == {'NVDA': (0, 5), 'MSFT': (0, 2)}
+    assert RowFilter(min_count=0, limit=2).select_counts(counts) == {'NVDA': (0, 5), 'MSFT': (0, 2)}
+    assert RowFilter(tickers=[' ko ']).select_counts(counts) == {'KO': (1, 1)}
+
+ROWS = [
+    {'Stock': 'NVDA', 'Transaction': 'Purchase', 'Traded': 'Oct 01, 2026'},
+    {'Stock': 'AAPL', 'Transaction': 'Sale (Partial)', 'Traded': 'Oct 05, 2026'},
+    {'Stock': 'MSFT', 'Transaction': 'Purchase', 'Traded': '2026-10-03 00:00:00'},
+    {'Stock': 'KO', 'Transaction': 'Purchase', 'Traded': 'soon'},
+    {'Stock': 'XOM', 'Transaction': 'Purchase', 'Traded': 'Sept 28, 2026'},
+]
+
+def test_most_recent():
+    assert [row['Stock'] for row in most_recent(ROWS, 3)] == ['AAPL', 'MSFT', 'NVDA']
+    # Unreadable dates sort last
+    assert most_recent(ROWS, 5)[-1]['Stock'] == 'KO'
+    assert most_recent([], 3) == []
+
+def test_filter_congress_rows():
+    filters = RowFilter(action='purchase', since='2026-10-01')
+    assert [row['Stock'] for row in filter_congress_rows(ROWS, filters)] == ['NVDA', 'MSFT']
+    assert [row['Stock'] for row in filter_congress_rows(ROWS, RowFilter(action='sale'))] == ['AAPL']
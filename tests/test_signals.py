@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pandas as pd
+
+from signals import (
+    conviction_score, congress_frame, collapse_insider_history, build_index, join_signals, load_history,
+    make_frame, normalize_ticker
+)
+
+def test_normalize_ticker():
+    assert normalize_ticker(' brk.b ') == 'BRK-B'
+    assert normalize_ticker('$BRK/B') == 'BRK-B'
+    assert normalize_ticker('-') is None
+    assert normalize_ticker(None) is None
+
+def test_conviction_score_ranks_sources_before_purchases():
+    assert conviction_score(2, 0) > conviction_score(1, 10_000)
+    assert conviction_score(1, 5) > conviction_score(1, 1) > conviction_score(1, 0)
+    assert conviction_score(3, 10_000) < 4
+
+def test_congress_frame_counts_each_trade_once():
+    trade = {'Stock': 'NVDA', 'Transaction': 'Purchase', 'Politician': 'Nancy Pelosi', 'Traded': 'Oct 01, 2026'}
+    rows = [
+        trade,
+        # The same trade from a snapshot CSV
+        {**trade, 'Stock': 'nvda', 'Politician': 'Nancy Pelosi ', 'Traded': '2026-10-01'},
+        {**trade, 'Politician': 'Ro Khanna'},
+        {**trade, 'Transaction': 'Sale'},
+    ]
+    assert build_index(congress_frame(rows))['NVDA'][0] == 2
+
+def test_collapse_insider_history():
+    df = make_frame([
+        ('AAPL', 3, datetime(2026, 10, 10)),
+        ('AAPL', 3, datetime(2026, 10, 10, 12)),
+        ('AAPL', 4, datetime(2026, 10, 10, 18)),
+        ('AAPL', 3, datetime(2026, 10, 12)),
+        ('AAPL', 5, datetime(2026, 10, 17)),
+    ])
+    assert build_index(collapse_insider_history(df))['AAPL'][0] == 4 + 3 + 5
+    assert build_index(collapse_insider_history(df, pd.Timestamp('2026-10-12')))['AAPL'] == \
+        (4, pd.Timestamp('2026-10-10'))
+
+def test_load_history_duplicate_snapshots(tmp_path):
+    day = tmp_path / '10-01-2026'
+    day.mkdir()
+    for run in ('09-00-00', '12-00-00'):
+        (day / f'insider_trading_data_{run}.csv').write_text('ticker,purchases\nAAPL,6\n')
+    history = load_history(str(tmp_path))
+    assert build_index(collapse_insider_history(history['insider']))['AAPL'][0] == 6
+
+def test_join_signals():
+    now = datetime(2026, 10, 19)
+    indexes = {
+        'zacks': {'NVDA': (1, pd.Timestamp(now)), 'KO': (1, pd.Timestamp(now))},
+        'congress': {'NVDA': (2, pd.Timestamp('2026-10-12'))},
+        'insider': {'KO': (5, pd.NaT)},
+    }
+    ranked = join_signals(indexes, now=now)
+    assert list(ranked['ticker']) == ['KO', 'NVDA']
+    nvda = ranked.set_index('ticker').loc['NVDA']
+    assert nvda['sources'] == 'zacks,congress'
+    assert nvda['purchases'] == 3
+    assert nvda['last_seen'] == '2026-10-19'
+    # The week-old congress purchases count for half
+    assert nvda['score'] == round(conviction_score(2, 1 + 2 * 0.5), 3)
@@ -0,0 +1,79 @@
+from bs4 import BeautifulSoup
+import pytest
+
+from conftest import read_fixture
+from rowfilter import RowFilter
+from scrape import CONFIG
+from scraper import count_transactions, extract_insider_data, insider_dataframe, rank_insider_purchases, select_table
+from analyzer import extract_congress_data
+from stream import stream_table_rows, count_streamed_transactions, stream_congress_data
+
+PAGES = [
+    ('congress', 'congress.html'),
+    ('insider', 'insider.html'),
+    ('insider', 'insider_reordered.html'),
+]
+
+def soup_table(html, selector):
+    return select_table(BeautifulSoup(html, 'html.parser'), selector)
+
+def chunked(html, size):
+    """Split a page the way a download would, cutting through tags and text."""
+    return [html[i:i + size] for i in range(0, len(html), size)]
+
+@pytest.mark.parametrize('source, page', PAGES)
+@pytest.mark.parametrize('chunk_size', [7, 64, 1 << 16])
+@pytest.mark.parametrize('filters', [
+    None,
+    RowFilter(action='purchase'),
+    RowFilter(action='purchase', since='2026-10-02'),
+    RowFilter(tickers=['nvda']),
+], ids=['none', 'purchases', 'since', 'ticker'])
+def test_streamed_counts_match_soup(source, page, chunk_size, filters):
+    cfg = CONFIG[source]
+    html = read_fixture(page)
+
+    table = soup_table(html, cfg['selector'])
+    expected = count_transactions(table, cfg['ticker_extractor'], cfg['sale_detector'](table),
+                                  filters, cfg['date_extractor'](table))
+
+    header = []
+    rows = stream_table_rows(cfg['url'], cfg['selector'], chunks=chunked(html, chunk_size), header=header)
+    streamed = count_streamed_transactions(rows, cfg['row_ticker'], cfg['row_sale'](header),
+                                           filters, cfg['row_date'](header))
+
+    assert streamed == expected
+    assert expected
+
+@pytest.mark.parametrize('filters', [None, RowFilter(action='purchase', since='2026-10-01')])
+def test_streamed_congress_rows_match_soup(monkeypatch, filters):
+    cfg = CONFIG['congress']
+    html = read_fixture('congress.html')
+    monkeypatch.setattr('stream.iter_html', lambda *args, **kwargs: iter(chunked(html, 13)))
+
+    expected = extract_congress_data(soup_table(html, cfg['selector']), filters)
+    assert stream_congress_data(cfg['url'], cfg['selector'], filters=filters) == expected
+
+def test_stream_stops_at_table_end():
+    cfg = CONFIG['congress']
+    html = read_fixture('congress.html')
+    consumed = []
+
+    def chunks():
+        for chunk in chunked(html, 32):
+            consumed.append(chunk)
+            yield chunk
+
+    list(stream_table_rows(cfg['url'], cfg['selector'], chunks=chunks()))
+    assert ''.join(consumed) != html
+    assert 'footer' not in ''.join(consumed[:-1])
+
+@pytest.mark.parametrize('page', ['insider.html', 'insider_reordered.html'])
+def test_insider_sales_agree_with_ranking(page):
+    cfg = CONFIG['insider']
+    table = soup_table(read_fixture(page), cfg['selector'])
+    counts = count_transactions(table, cfg['ticker_extractor'], cfg['sale_detector'](table))
+    ranked = rank_insider_purchases(insider_dataframe(extract_insider_data(table)), by='purchases')
+
+    purchased = {ticker: purchases for ticker, (sales, purchases) in counts.items() if purchases}
+    assert purchased == ranked['purchases'].to_dict()